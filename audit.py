@@ -0,0 +1,196 @@
+# Provable-Result Giveaway Discord Bot | Copyright (C) 2019, An Tran
+# https://github.com/trantinan2512/provable-giveaway-bot
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+"""
+Offline auditor of giveaway results, it doesn't need the database or Discord.
+
+Seeds CSV columns: server_seed_hashed, server_seed (the revealed Server Seeds).
+Winners CSV columns: giveaway_id, draw_version, server_seed_hashed, user_seed, nonce,
+participant_count, winner_count, index. Winners of the same giveaway must be on consecutive rows.
+
+Usage: python3 audit.py seeds.csv winners.csv [--workers N] [--batch-size N]
+"""
+
+import argparse
+import csv
+import hashlib
+import os
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+from utils.draw import DRAW_V1, DRAW_V2, shuffle_step
+from utils.pfair import pfair_index
+
+
+def read_seeds(path):
+    """Returns a dict of Server Seed - Hashed -> Server Seed, checking every Server Seed against its hash."""
+    seeds = {}
+    with open(path, newline='') as seeds_file:
+        for row in csv.DictReader(seeds_file):
+            server_seed = row['server_seed']
+            server_seed_hashed = row['server_seed_hashed']
+            if hashlib.sha512(server_seed.encode()).hexdigest() != server_seed_hashed:
+                raise SystemExit(f'Server Seed does not match its hash: {server_seed_hashed}')
+            seeds[server_seed_hashed] = server_seed
+
+    return seeds
+
+
+def read_giveaways(path):
+    """Yields the winner rows of each giveaway as a list, streaming the file."""
+    rows = []
+    with open(path, newline='') as winners_file:
+        for row in csv.DictReader(winners_file):
+            if rows and row['giveaway_id'] != rows[0]['giveaway_id']:
+                yield rows
+                rows = []
+            rows.append(row)
+
+    if rows:
+        yield rows
+
+
+def audit_giveaway(rows, seeds):
+    """Returns the list of mismatch descriptions of a giveaway's winner rows."""
+    first = rows[0]
+    giveaway_id = first['giveaway_id']
+    draw_version = int(first['draw_version'])
+    user_seed = first['user_seed']
+    participant_count = int(first['participant_count'])
+    winner_count = int(first['winner_count'])
+
+    server_seed = seeds.get(first['server_seed_hashed'])
+    if server_seed is None:
+        return [f'Giveaway [{giveaway_id}]: Server Seed not revealed ({first["server_seed_hashed"][:16]}...)']
+
+    # sure win, no Provable Fairness Information used
+    if participant_count <= winner_count:
+        return [
+            f'Giveaway [{giveaway_id}]: sure win with Index {row["index"]} and Nonce {row["nonce"]} (expected 0 and 0)'
+            for row in rows
+            if int(row['index']) != 0 or int(row['nonce']) != 0
+        ]
+
+    mismatches = []
+    draws = sorted((int(row['nonce']), int(row['index'])) for row in rows)
+
+    if draw_version == DRAW_V1:
+        for nonce, index in draws:
+            expected = pfair_index(server_seed, user_seed, nonce, participant_count)
+            if index != expected:
+                mismatches.append(f'Giveaway [{giveaway_id}]: Nonce {nonce} gives Index {expected}, not {index}')
+
+    elif draw_version == DRAW_V2:
+        # the shuffle is replayed from the first nonce, one step per winner
+        first_nonce = draws[0][0]
+        swapped = {}
+        for step, (nonce, index) in enumerate(draws):
+            if nonce != first_nonce + step:
+                mismatches.append(f'Giveaway [{giveaway_id}]: Nonce {nonce} is not consecutive (expected {first_nonce + step})')
+                break
+
+            expected = shuffle_step(swapped, step, participant_count, server_seed, user_seed, nonce)
+            if index != expected:
+                mismatches.append(f'Giveaway [{giveaway_id}]: Nonce {nonce} gives Index {expected}, not {index}')
+
+    else:
+        mismatches.append(f'Giveaway [{giveaway_id}]: unknown draw version {draw_version}')
+
+    return mismatches
+
+
+def audit_batch(giveaways, seeds):
+    """Returns (number of winner rows, list of mismatch descriptions) of a batch of giveaways."""
+    mismatches = []
+    for rows in giveaways:
+        mismatches.extend(audit_giveaway(rows, seeds))
+
+    return sum(len(rows) for rows in giveaways), mismatches
+
+
+def batches(giveaways, batch_size):
+    """Groups giveaways into lists of about `batch_size` winner rows."""
+    batch = []
+    row_count = 0
+    for rows in giveaways:
+        batch.append(rows)
+        row_count += len(rows)
+        if row_count >= batch_size:
+            yield batch
+            batch = []
+            row_count = 0
+
+    if batch:
+        yield batch
+
+
+_seeds = None
+
+
+def _init_worker(seeds):
+    # seeds are sent once per worker instead of with every batch
+    global _seeds
+    _seeds = seeds
+
+
+def _audit_batch_in_worker(giveaways):
+    return audit_batch(giveaways, _seeds)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Recomputes the Index of every winner and reports mismatches.')
+    parser.add_argument('seeds', help='CSV of revealed seeds (server_seed_hashed, server_seed).')
+    parser.add_argument('winners', help='CSV of winner rows, winners of the same giveaway on consecutive rows.')
+    parser.add_argument('--workers', type=int, default=os.cpu_count(), help='Number of processes (default: all cores).')
+    parser.add_argument('--batch-size', type=int, default=10000, help='Winner rows per batch (default: 10000).')
+    args = parser.parse_args()
+
+    seeds = read_seeds(args.seeds)
+    started_at = time.monotonic()
+    audited_count = 0
+    mismatch_count = 0
+
+    with ProcessPoolExecutor(max_workers=args.workers, initializer=_init_worker, initargs=(seeds,)) as executor:
+        # at most 2 batches per worker are read ahead, so memory doesn't grow with the input
+        max_pending = args.workers * 2
+        pending = set()
+
+        def collect(done):
+            nonlocal audited_count, mismatch_count
+            for future in done:
+                row_count, mismatches = future.result()
+                audited_count += row_count
+                mismatch_count += len(mismatches)
+                for mismatch in mismatches:
+                    print(f'[MISMATCH] {mismatch}')
+
+        for batch in batches(read_giveaways(args.winners), args.batch_size):
+            if len(pending) >= max_pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                collect(done)
+            pending.add(executor.submit(_audit_batch_in_worker, batch))
+
+        collect(wait(pending).done)
+
+    duration = time.monotonic() - started_at
+    print(f'Audited {audited_count} winners in {duration:.2f}s, {mismatch_count} mismatches.')
+
+    return 1 if mismatch_count else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -3,6 +3,12 @@ import discord
 from discord.ext import commands
 from django.conf import settings
 
+from bot.cache import apply_low_memory_mode, PinnedMessageCache
+from bot.entrants import EntrantTracker
+from bot.outbound import OutboundScheduler, PRIORITY_REPLY
+from bot.prompts import PromptDispatcher
+from bot.scheduler import GiveawayScheduler
+
 
 class CustomContext(commands.Context):
     async def say_as_embed(
@@ -44,22 +50,50 @@ class CustomContext(commands.Context):
             if footer_text:
                 embed.set_footer(text=footer_text)
 
-        message = await self.send(embed=embed, delete_after=delete_after)
+        message = await self.bot.outbound.send(self, priority=PRIORITY_REPLY, embed=embed, delete_after=delete_after)
 
         return message
 
 
 class CustomBot(commands.Bot):
 
-    def __init__(self, **kwargs):
+    def __init__(self, low_memory=settings.LOW_MEMORY_MODE, **kwargs):
         infos = {
             'command_prefix': '.' if settings.DEBUG is True else settings.BOT_PREFIX,
             'owner_id': settings.BOT_OWNER_ID
         }
+        if low_memory:
+            # members are never requested from Discord, see `apply_low_memory_mode` for the other caches
+            infos['fetch_offline_members'] = False
         super().__init__(**infos, **kwargs)
+
+        self.low_memory = low_memory
+        if low_memory:
+            apply_low_memory_mode(self._connection, settings.GIVEAWAY_MESSAGE_CACHE_SIZE)
+
         # remove the default 'help' command
         self.remove_command('help')
 
+        # ongoing giveaways, woken up by their deadlines (see bot/tasks/giveawaytask.py)
+        self.giveaway_scheduler = GiveawayScheduler(
+            retry_delay=settings.UPDATE_GIVEAWAY_REMAINING_TIME_DELAY if not settings.DEBUG else 5
+        )
+        # entrants of ongoing giveaways, kept from reaction events (see bot/tasks/entranttask.py)
+        self.entrant_tracker = EntrantTracker()
+        # every Discord write goes through it, by channel and priority
+        self.outbound = OutboundScheduler(loop=self.loop)
+        # pending `validate_input` prompts, answered from `on_message`
+        self.prompts = PromptDispatcher(loop=self.loop)
+
+    def pin_message(self, message):
+        """Keeps `message` (a giveaway message) in the message cache of the low-memory mode."""
+        if isinstance(self._connection._messages, PinnedMessageCache):
+            self._connection._messages.pin(message)
+
+    async def close(self):
+        self.outbound.close()
+        await super().close()
+
     async def on_ready(self):
         print('------')
         print(f'Logged in as: {self.user.name} (ID: {self.user.id})')
@@ -67,7 +101,34 @@ class CustomBot(commands.Bot):
         presence = f'Prefix: {self.command_prefix}' if not settings.DEBUG else 'sensei anone'
         await self.change_presence(activity=discord.Game(name=presence))
 
+    def could_be_command(self, message):
+        """
+        Cheap check of every message before `get_context`: False when `message` can't invoke a command,
+        because its author is a bot or it doesn't start with the prefix or a mention of the bot.
+        """
+        if message.author.bot:
+            return False
+
+        prefix = self.command_prefix
+        # a prefix function depends on the message, only `get_context` knows
+        if callable(prefix):
+            return True
+
+        content = message.content
+        if content.startswith(prefix if isinstance(prefix, str) else tuple(prefix)):
+            return True
+
+        return content.startswith('<@') and self.user is not None and \
+            content.startswith((f'<@{self.user.id}>', f'<@!{self.user.id}>'))
+
     async def on_message(self, message):
+        # prompt replies ("yes", a prize name...) don't start with the prefix
+        self.prompts.dispatch(message)
+
+        # almost every message isn't a command, don't build a context for them
+        if not self.could_be_command(message):
+            return
+
         ctx = await self.get_context(message, cls=CustomContext)
         await self.invoke(ctx)
 
@@ -100,7 +161,7 @@ class CustomBot(commands.Bot):
                 context.command.help.format(prefix=prefix, command_name=command_name),
                 color=settings.EMBED_DEFAULT_COLOR
             )
-            await context.send(embed=embed)
+            await context.say_as_embed(embed=embed)
             return
 
         await super().on_command_error(context, error)
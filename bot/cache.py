@@ -0,0 +1,73 @@
+from collections import deque
+
+
+class PinnedMessageCache(deque):
+    """
+    Message cache of the low-memory mode, it replaces discord.py's cache of every recent message.
+    Only messages pinned with `pin()` (giveaway messages) are kept, at most `maxlen` of them.
+    """
+
+    def append(self, message):
+        # discord.py caches every message it receives, those are dropped
+        pass
+
+    def pin(self, message):
+        if not any(cached.id == message.id for cached in self):
+            super().append(message)
+
+
+def _wrap_parser(state, event, before=None, after=None):
+    parse = state.parsers[event]
+
+    def wrapped(data):
+        if before is not None:
+            before(data)
+        parse(data)
+        if after is not None:
+            after(data)
+
+    state.parsers[event] = wrapped
+
+
+def _only_self(state, event):
+    """Makes the parser of a single member `event` ignore the members other than the bot itself."""
+    parse = state.parsers[event]
+
+    def wrapped(data):
+        if data['user']['id'] == str(state.self_id):
+            parse(data)
+
+    state.parsers[event] = wrapped
+
+
+def apply_low_memory_mode(state, message_cache_size):
+    """
+    Trims the caches of a discord.py `ConnectionState` to what the bot reads:
+    • guild members aren't cached (except the bot itself, for its permissions), not even those joining
+      after the bot's start, neither are presences
+    • the message cache only keeps pinned giveaway messages (see `PinnedMessageCache`)
+    Offline members are not fetched either, that's the `fetch_offline_members=False` option of the client.
+    """
+
+    def install_message_cache(data=None):
+        # discord.py replaces its message cache when it clears its state or leaves a guild
+        if not isinstance(state._messages, PinnedMessageCache):
+            state._messages = PinnedMessageCache(state._messages, maxlen=message_cache_size)
+
+    def strip_members(data):
+        self_id = str(state.self_id)
+        data['members'] = [member for member in data.get('members', []) if member['user']['id'] == self_id]
+
+    def strip_guild(data):
+        strip_members(data)
+        data['presences'] = []
+
+    state._messages = PinnedMessageCache(maxlen=message_cache_size)
+    _wrap_parser(state, 'READY', after=install_message_cache)
+    _wrap_parser(state, 'GUILD_DELETE', after=install_message_cache)
+    _wrap_parser(state, 'GUILD_CREATE', before=strip_guild)
+    _wrap_parser(state, 'GUILD_MEMBERS_CHUNK', before=strip_members)
+    # members joining (or updated) later would fill the member cache up again
+    _only_self(state, 'GUILD_MEMBER_ADD')
+    _only_self(state, 'GUILD_MEMBER_UPDATE')
+    state.parsers['PRESENCE_UPDATE'] = lambda data: None
@@ -1,7 +1,9 @@
+import asyncio
+import csv
 import io
+import json
 import traceback
 
-import dateparser as dateparser
 import discord
 from datetime import datetime, timezone
 from discord.ext import commands
@@ -14,12 +16,62 @@ from .helptexts import (
     _ga_reroll_brief, _ga_reroll_help,
     _ga_delete_brief, _ga_delete_help,
     _ga_result_brief, _ga_result_help,
+    _ga_bulkcreate_brief, _ga_bulkcreate_help,
 )
-from utils.objects import get_user_obj, get_guild_obj
+from utils.dates import aparse_datetime
+from utils.db import run_in_db_thread
+from utils.objects import aget_user_obj, aget_guild_obj
 from bot.validators import validate_input
 from bot.converters import OwnedGiveawayConverted
 
 
+# limits of the file uploaded with `bulkcreate`
+BULK_CREATE_MAX_ROWS = 50
+BULK_CREATE_MAX_FILE_SIZE = 64 * 1024
+BULK_CREATE_COLUMNS = ('prize', 'winners', 'end', 'channel')
+
+
+def read_bulk_file(filename, data):
+    """
+    Returns the rows of a `bulkcreate` file, as dicts of `BULK_CREATE_COLUMNS`.
+    `.csv` files have a header row, `.json` files are a list of objects.
+    """
+    try:
+        text = data.decode('utf-8-sig')
+    except UnicodeDecodeError:
+        raise commands.BadArgument('The file must be UTF-8 encoded.')
+
+    if filename.lower().endswith('.csv'):
+        reader = csv.DictReader(io.StringIO(text))
+        if reader.fieldnames is None:
+            raise commands.BadArgument('The file is empty.')
+        reader.fieldnames = [name.strip().lower() for name in reader.fieldnames]
+        rows = list(reader)
+    elif filename.lower().endswith('.json'):
+        try:
+            rows = json.loads(text)
+        except ValueError as e:
+            raise commands.BadArgument(f'The file is not valid JSON ({e}).')
+        if not isinstance(rows, list) or not all(isinstance(row, dict) for row in rows):
+            raise commands.BadArgument('The file must be a list of objects.')
+        rows = [{str(key).strip().lower(): value for key, value in row.items()} for row in rows]
+    else:
+        raise commands.BadArgument('The file must be a `.csv` or a `.json` file.')
+
+    if not rows:
+        raise commands.BadArgument('The file has no giveaways.')
+    missing = [column for column in BULK_CREATE_COLUMNS if column not in rows[0]]
+    if missing:
+        raise commands.BadArgument(f'Missing columns: {", ".join(f"`{column}`" for column in missing)}.')
+    if len(rows) > BULK_CREATE_MAX_ROWS:
+        raise commands.BadArgument(f'The file has {len(rows)} giveaways, the maximum is {BULK_CREATE_MAX_ROWS}.')
+
+    return [
+        {column: str(row.get(column) if row.get(column) is not None else '').strip() for column in BULK_CREATE_COLUMNS}
+        for row in rows
+    ]
+
+
 class MissingManageGuildPermissionAndGiveawayRole(commands.CheckFailure):
     def __init__(self, message=None):
         super().__init__(
@@ -51,8 +103,8 @@ class GiveawayCommands(commands.Cog):
     @commands.check(manage_guild_or_giveaway_role)
     async def _interactive_setup(self, context):
 
-        user_obj, _ = get_user_obj(context.author)
-        guild_obj, _ = get_guild_obj(context.guild)
+        user_obj, _ = await aget_user_obj(context.author)
+        guild_obj, _ = await aget_guild_obj(context.guild)
 
         ga_data = {
             'creator': user_obj,
@@ -99,7 +151,7 @@ class GiveawayCommands(commands.Cog):
                 return
 
             async with context.channel.typing():
-                parsed_dt = dateparser.parse(response.content, settings={'RETURN_AS_TIMEZONE_AWARE': True})
+                parsed_dt = await aparse_datetime(response.content)
 
             if not parsed_dt:
                 await context.say_as_embed(
@@ -180,42 +232,53 @@ class GiveawayCommands(commands.Cog):
             value='Y/N'
         )
 
-        await context.send(embed=embed)
+        await context.say_as_embed(embed=embed)
 
         response = await validate_input(context, inputs=['y', 'yes', 'n', 'no'])
         if response is False:
             return
 
         # create the giveaway based on collected user inputs
-        ga_obj = Giveaway.objects.create(**ga_data)
+        ga_obj = await run_in_db_thread(Giveaway.objects.create, **ga_data)
 
         # send the giveaway embedded message
+        embed = await ga_obj.aembed()
         try:
-            ga_message = await ga_channel.send(embed=ga_obj.embed)
+            ga_message = await self.bot.outbound.send(ga_channel, embed=embed)
         except discord.HTTPException:
-            ga_obj.delete()
+            await ga_obj.adelete()
             await context.say_as_embed('Sending message failed. Please try again.', color='error')
             return
 
         # get the message ID and save to database
+        ga_obj.rendered_embed = embed.to_dict()
         ga_obj.message_id = ga_message.id
-        ga_obj.save()
+        await ga_obj.asave()
+
+        # entrants are tracked from their reactions from now on
+        self.bot.entrant_tracker.track(ga_obj)
+        self.bot.pin_message(ga_message)
 
         # get the emoji
         emoji = self.bot.get_emoji(settings.REACT_EMOJI_ID)
         if not emoji:
-            ga_obj.delete()
+            self.bot.entrant_tracker.untrack(ga_obj)
+            await ga_obj.adelete()
             await context.say_as_embed(f'Emoji with ID {settings.REACT_EMOJI_ID} does not exist.', color='error')
             return
 
         # try to react with the customized emoji
         try:
-            await ga_message.add_reaction(emoji)
+            await self.bot.outbound.add_reaction(ga_message, emoji)
         except discord.HTTPException:
-            ga_obj.delete()
+            self.bot.entrant_tracker.untrack(ga_obj)
+            await ga_obj.adelete()
             await context.say_as_embed(f'Reacting with emoji {str(emoji)} failed.', color='error')
             return
 
+        # wake up the giveaway task at this giveaway's deadline
+        self.bot.giveaway_scheduler.schedule(ga_obj)
+
         # after all those checks, it's finally here, phew!
         await context.say_as_embed(
             title='Giveaway Created!',
@@ -225,19 +288,213 @@ class GiveawayCommands(commands.Cog):
             color='success'
         )
 
+    async def validate_bulk_row(self, context, row):
+        """
+        Returns the Giveaway data and the channel of a `bulkcreate` row,
+        raises `commands.BadArgument` with the reason if the row is invalid.
+        """
+        if not row['prize'] or len(row['prize']) > 200:
+            raise commands.BadArgument('The prize must have 1 to 200 characters.')
+
+        if row['winners'] not in [str(n) for n in range(1, 21)]:
+            raise commands.BadArgument('The number of winners must be between 1 and 20.')
+
+        parsed_dt = await aparse_datetime(row['end']) if row['end'] else None
+        if not parsed_dt:
+            raise commands.BadArgument('Unable to convert the end date time.')
+        if parsed_dt < datetime.now(timezone.utc):
+            raise commands.BadArgument(f'The end time `{parsed_dt:%H:%M:%S %A %B %d, %Y (%Z)}` is already in the past.')
+
+        # a file has "#giveaways" as text, not as a channel mention
+        channel_text = row['channel'][1:] if row['channel'].startswith('#') else row['channel']
+        channel = await commands.TextChannelConverter().convert(context, channel_text)
+        if channel.guild != context.guild:
+            raise commands.BadArgument('The channel must be in this server.')
+
+        perms = channel.permissions_for(context.guild.me)
+        if perms.send_messages is False or perms.add_reactions is False:
+            raise commands.BadArgument(f'I can\'t send messages or add reactions (missing permissions) in {channel.mention}.')
+
+        ga_data = {
+            'prize': discord.utils.escape_markdown(row['prize']),
+            'winner_count': int(row['winners']),
+            'ending_at': parsed_dt,
+            'ended_time_str': f'{parsed_dt:%H:%M:%S %A %B %d, %Y (%Z)}',
+            'channel_id': channel.id,
+        }
+        return ga_data, channel
+
+    async def post_bulk_giveaway(self, ga_obj, channel, embed, emoji):
+        """Posts a giveaway created by `bulkcreate` and reacts to it, returns why it failed or None."""
+        ga_message = None
+        try:
+            ga_message = await self.bot.outbound.send(channel, embed=embed)
+
+            ga_obj.rendered_embed = embed.to_dict()
+            ga_obj.message_id = ga_message.id
+
+            self.bot.entrant_tracker.track(ga_obj)
+            self.bot.pin_message(ga_message)
+
+            await self.bot.outbound.add_reaction(ga_message, emoji)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            self.bot.entrant_tracker.untrack(ga_obj)
+
+            if not isinstance(e, discord.HTTPException):
+                print(f'[Bulk Create] Posting Giveaway ID [{ga_obj.id}] raised an exception:')
+                traceback.print_exception(type(e), e, e.__traceback__)
+                reason = 'Posting the giveaway failed.'
+            elif ga_message is None:
+                reason = 'Sending message failed.'
+            else:
+                reason = f'Reacting with emoji {str(emoji)} failed.'
+
+            # the giveaway is deleted, its message must not stay behind
+            if ga_message is not None:
+                try:
+                    await self.bot.outbound.submit(channel.id, ga_message.delete)
+                except discord.HTTPException:
+                    pass
+
+            return reason
+
+        return None
+
+    @commands.command(name='bulkcreate', brief=_ga_bulkcreate_brief, help=_ga_bulkcreate_help)
+    @commands.guild_only()
+    @commands.check(manage_guild_or_giveaway_role)
+    async def _bulk_create(self, context):
+
+        if not context.message.attachments:
+            await context.say_as_embed(
+                f'Please attach a `.csv` or `.json` file to the command, see `{context.prefix}help {context.invoked_with}`.',
+                color='error')
+            return
+
+        attachment = context.message.attachments[0]
+        if attachment.size > BULK_CREATE_MAX_FILE_SIZE:
+            await context.say_as_embed(
+                f'The file is too large, the maximum is {BULK_CREATE_MAX_FILE_SIZE // 1024} KB.', color='error')
+            return
+
+        emoji = self.bot.get_emoji(settings.REACT_EMOJI_ID)
+        if not emoji:
+            await context.say_as_embed(f'Emoji with ID {settings.REACT_EMOJI_ID} does not exist.', color='error')
+            return
+
+        try:
+            rows = read_bulk_file(attachment.filename, await attachment.read())
+        except discord.HTTPException:
+            await context.say_as_embed('Downloading the file failed. Please try again.', color='error')
+            return
+        except commands.BadArgument as e:
+            await context.say_as_embed(str(e), color='error')
+            return
+
+        # every row is validated before anything is created
+        # row number -> result line
+        results = {}
+        valid_rows = []
+        async with context.channel.typing():
+            for row_number, row in enumerate(rows, 1):
+                try:
+                    ga_data, channel = await self.validate_bulk_row(context, row)
+                except commands.BadArgument as e:
+                    results[row_number] = f'Failed: {e}'
+                else:
+                    valid_rows.append((row_number, ga_data, channel))
+
+        if valid_rows:
+            user_obj, _ = await aget_user_obj(context.author)
+            guild_obj, _ = await aget_guild_obj(context.guild)
+
+            def create_giveaways():
+                ga_objs = Giveaway.objects.bulk_create([
+                    Giveaway(creator=user_obj, guild=guild_obj, **ga_data) for _, ga_data, _ in valid_rows
+                ])
+                # on going giveaways render without any query
+                return ga_objs, [ga_obj.embed for ga_obj in ga_objs]
+
+            ga_objs, embeds = await run_in_db_thread(create_giveaways)
+
+            # sent at the pace of each channel's queue, channels in parallel
+            errors = await asyncio.gather(*(
+                self.post_bulk_giveaway(ga_obj, channel, embed, emoji)
+                for ga_obj, (_, _, channel), embed in zip(ga_objs, valid_rows, embeds)
+            ))
+
+            created = [ga_obj for ga_obj, error in zip(ga_objs, errors) if error is None]
+            failed_ids = [ga_obj.id for ga_obj, error in zip(ga_objs, errors) if error is not None]
+
+            def save_posted_giveaways():
+                # `rendered_embed` isn't a field, it is kept on the objects the scheduler holds
+                Giveaway.objects.bulk_update(created, ['message_id'])
+                Giveaway.objects.filter(id__in=failed_ids).delete()
+
+            await run_in_db_thread(save_posted_giveaways)
+
+            for ga_obj, (row_number, _, channel), error in zip(ga_objs, valid_rows, errors):
+                if error is None:
+                    self.bot.giveaway_scheduler.schedule(ga_obj)
+                    results[row_number] = f'Created Giveaway `{ga_obj.id}` in {channel.mention}'
+                else:
+                    results[row_number] = f'Failed: {error}'
+
+        created_count = sum(result.startswith('Created') for result in results.values())
+        if created_count == len(rows):
+            color = discord.Color.green()
+        elif created_count:
+            color = discord.Color.gold()
+        else:
+            color = discord.Color.red()
+
+        lines = '\n'.join(f'• Row {row_number}: {results[row_number]}' for row_number in sorted(results))
+        summary = f'**{created_count}** of **{len(rows)}** giveaways created.\n\n'
+
+        # the per-row results go in a file when they don't fit in the embed
+        file = None
+        if len(summary) + len(lines) > 2048:
+            summary += 'The result of every row is in the attached file.'
+            file = discord.File(io.BytesIO(lines.encode()), 'bulkcreate_results.txt')
+        else:
+            summary += lines
+
+        embed = discord.Embed(title='Bulk Giveaway Creation', description=summary, color=color)
+        await self.bot.outbound.send(context, embed=embed, file=file)
+
     @commands.command(name='end', brief=_ga_end_brief, help=_ga_end_help)
     @commands.guild_only()
     @commands.check(manage_guild_or_giveaway_role)
     async def _end_giveaway(self, context, ga_obj: OwnedGiveawayConverted):
 
+        if ga_obj.is_archived:
+            await context.say_as_embed(
+                f'Your Giveaway (ID: `{ga_obj.id}`) already ended and has been archived. '
+                f'Use `{context.prefix}result {ga_obj.id}` to retrieve its result.'
+            )
+            return
+
         ga_obj.bot = self.bot
         await ga_obj.end(context=context)
 
+        if ga_obj.success is not None:
+            self.bot.giveaway_scheduler.unschedule(ga_obj.id)
+            self.bot.entrant_tracker.untrack(ga_obj)
+
     @commands.command(name='reroll', brief=_ga_reroll_brief, help=_ga_reroll_help)
     @commands.guild_only()
     @commands.check(manage_guild_or_giveaway_role)
     async def _reroll_giveaway(self, context, ga_obj: OwnedGiveawayConverted):
 
+        if ga_obj.is_archived:
+            await context.say_as_embed(
+                f'Your Giveaway (ID: `{ga_obj.id}`) has been archived and can no longer be rerolled. '
+                f'Use `{context.prefix}result {ga_obj.id}` to retrieve its result.', color='warning'
+            )
+            return
+
         ga_obj.bot = self.bot
         await ga_obj.end(for_reroll=True, context=context)
 
@@ -263,18 +520,15 @@ class GiveawayCommands(commands.Cog):
 
         # tries to delete the giveaway message
         ga_obj.bot = self.bot
-        discord_message = await ga_obj.discord_message()
-        if discord_message:
-            try:
-                await discord_message.delete()
-            except discord.HTTPException:
-                pass
+        await ga_obj.delete_message()
 
         # collects the GA ID before deleting it
         ga_obj_id = ga_obj.id
 
         # deletes the GA object from database
-        ga_obj.delete()
+        self.bot.entrant_tracker.untrack(ga_obj)
+        await ga_obj.adelete()
+        self.bot.giveaway_scheduler.unschedule(ga_obj_id)
 
         await context.say_as_embed(
             title=f'Giveaway ID [{ga_obj_id}] has been deleted',
@@ -296,10 +550,11 @@ class GiveawayCommands(commands.Cog):
 
         filename = f'GA{ga_obj.id}_{ga_obj.creator.discord_id}.txt'
 
-        str_data = io.BytesIO(ga_obj.info_text.encode())
-        await context.send(file=discord.File(str_data, filename))
+        str_data = io.BytesIO((await ga_obj.ainfo_text()).encode())
+        await self.bot.outbound.send(context, file=discord.File(str_data, filename))
 
     @_interactive_setup.error
+    @_bulk_create.error
     @_end_giveaway.error
     @_reroll_giveaway.error
     @_delete_giveaway.error
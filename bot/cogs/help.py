@@ -60,7 +60,7 @@ class HelpCommands(commands.Cog):
                 f'Type `{context.prefix}{context.invoked_with} [command name]`'
                 f' for more details on the command.',
             )
-            await context.send(embed=embed)
+            await context.say_as_embed(embed=embed)
 
 
 def setup(bot):
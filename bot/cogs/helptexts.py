@@ -16,6 +16,21 @@ _ga_create_help = (
     f'You must have at least **Manage Server** permission or have **Giveaway** role to use this command.'
 )
 
+_ga_bulkcreate_brief = (
+    'Create many Giveaways at once from an attached CSV or JSON file.'
+)
+_ga_bulkcreate_help = (
+    'Format: ```{prefix}{command_name}``` with a `.csv` or `.json` file attached.\n'
+    f'{_ga_bulkcreate_brief}\n'
+    'Each row (or JSON object) is a Giveaway with the columns `prize`, `winners`, `end` and `channel`, '
+    'filled in like the answers to the `create` steps. Example CSV:\n'
+    '```prize,winners,end,channel\n'
+    'Nitro,1,in 2 days,#giveaways\n'
+    'Steam Key,3,10AM June 24th PDT,#events```\n'
+    'Invalid rows are skipped, the result of every row is shown once all Giveaways are posted.\n'
+    'You must have at least **Manage Server** permission or have **Giveaway** role to use this command.'
+)
+
 _ga_end_params = 'Format: ```{prefix}{command_name} [Giveaway ID]```\n'
 _ga_end_brief = (
     'End your Giveaway.'
@@ -3,7 +3,8 @@ from discord.ext import commands
 
 from bot.validators import validate_input
 from utils.core import generate_server_seed
-from utils.objects import get_user_obj
+from utils.db import run_in_db_thread
+from utils.objects import aget_user_obj
 from .helptexts import (
     _pfair_algorithm_brief, _pfair_algorithm_help,
     _pfair_myseed_brief, _pfair_myseed_help,
@@ -23,7 +24,7 @@ algorithm_explanation_embed.add_field(
     name='Required information to check for correct results',
     value=
     '• You must renew your **User Seed** first. This will get you a **Server Seed (Unhashed)**.\n'
-    '• Collect the **Nonce**s from Giveaways you want to check for.\n'
+    '• Collect the **Nonce**s and the **Draw Version** from Giveaways you want to check for.\n'
     f'Use `{settings.BOT_PREFIX}result [Giveaway ID]` to get those info.'
 )
 algorithm_explanation_embed.add_field(
@@ -36,26 +37,38 @@ algorithm_explanation_embed.add_field(
     '• If they are 100% identical, the result of your Giveaway is NOT modified.\n\n'
 )
 algorithm_explanation_embed.add_field(
-    name='Step 2: Get your result from Randomization Algorithm',
+    name='Step 2: Generate the HMAC of each Nonce',
     value=
-    '• The algorithm uses the first 5 letters of generated HMAC. [Click here to generate]'
-    '(https://www.freeformatter.com/hmac-generator.html)\n'
+    '• [Click here to generate](https://www.freeformatter.com/hmac-generator.html)\n'
     '++ The first box is the combination of `[User Seed (before renewing)]-[Nonce]` (no brackets, and please notice that *dash*, senpai)\n'
     '++ Secret Key is the `Server Seed Unhashed`\n'
     '++ Digest algorithm is `SHA512`\n'
-    '• Convert those first 5 letters from the computed HMAC to decimal [here]'
+    '• Note that in order to pick winners, the bot first sorts (ascending) participants by their Discord ID. '
+    'This adds an extra layer of randomness as participants randomly join. '
+    'A participant\'s **Index** is his/her position in that list, starting from 0.\n'
+)
+algorithm_explanation_embed.add_field(
+    name='Step 3 (Draw Version 1): Get the Indexes',
+    value=
+    '• Convert the first 5 letters of the HMAC to decimal [here]'
     '(http://www.statman.info/conversions/hexadecimal.html)\n'
-    '• Finally, divide the number with the **total number of participants in the checking Giveaway** '
+    '• Divide that number by the **total number of participants** '
     '(use Google by typing in `[That Decimal Number] mod [Total Participants]`)\n'
-    '• Result of the calculation (**Remainder**) is the **Index** that represents in your Giveaway results.\n\n'
+    '• The **Remainder** is the **Index** of the winner.\n'
+    '• If that participant already won, the Nonce is skipped and the next one is used, '
+    'until the bot picks enough **distinct winners**.\n'
 )
 algorithm_explanation_embed.add_field(
-    name='Step 3: Crosscheck the results',
+    name='Step 3 (Draw Version 2): Shuffle the participants',
     value=
-    '• Note that in order to pick a winner, the bot first sorts (ascending) participants by their Discord ID. '
-    'This adds an extra layer of randomness as participants randomly join.\n'
-    '• Then with the **Remainder**, a winner is picked based on his/her **Index** in the list of sorted participants.\n'
-    '• This will repeat until the bot picks enough **distinct winners** as you tell it when creating the Giveaway.\n'
+    '• Winners are drawn one by one, with the Nonces in order. For winner number N (starting from 0):\n'
+    '++ Convert the **whole** HMAC to decimal, and divide it by `[Total Participants] - N`\n'
+    '++ Count **Remainder** positions after position N in the sorted list, and swap the participants '
+    'at both positions. The one now at position N wins.\n'
+    '• The HMAC is so large that the Remainder is never biased. In the (near impossible) case the HMAC is among '
+    'the last `2^512 mod [Total Participants - N]` numbers, it\'s skipped and the HMAC of `[User Seed]-[Nonce]-1` '
+    '(then `-2`, ...) is used instead.\n'
+    '• Each winner uses exactly one Nonce, and the **Index** shown is the winner\'s position in the sorted list.\n'
 )
 algorithm_explanation_embed.add_field(
     name='Values Used Explanation',
@@ -63,9 +76,8 @@ algorithm_explanation_embed.add_field(
     f'• **User Seed** - One of the factor to determine the randomness '
     f'while giving you the ability to check for results (only after renewing). '
     f'You can specify it by using `{settings.BOT_PREFIX}newseed [User Seed]`.\n'
-    f'• **Nonce** - A number that increases by 1 when your Provable Fairness Information is used to generate a random Index once. '
-    f'When picking winners, if the same winner is selected (same Index), **Nonce would increase**, until enough number of '
-    f'distinct winners are met.'
+    f'• **Nonce** - A number that increases by 1 when your Provable Fairness Information is used to generate a random Index once.\n'
+    f'• **Draw Version** - The algorithm your Giveaway was drawn with, Giveaways keep the version they were created with.\n'
     f'• **Server Seed - Hashed** - Hashed version of **Server Seed**, given to you in order to check for the result\'s integrity.\n'
     f'• **Server Seed - Unhashed** - The actual Server Seed, used as Secret Key to check for result and its integrity.'
 )
@@ -86,11 +98,11 @@ class ProvableFairnessCommands(commands.Cog):
 
     @commands.command(name='algorithm', help=_pfair_algorithm_help, brief=_pfair_algorithm_brief)
     async def _explain_pfair_algorithm(self, context):
-        await context.send(embed=algorithm_explanation_embed)
+        await context.say_as_embed(embed=algorithm_explanation_embed)
 
     @commands.command(name='myseed', help=_pfair_myseed_help, brief=_pfair_myseed_brief)
     async def _check_self_pfair_information(self, context):
-        user_obj, _ = get_user_obj(context.author)
+        user_obj, _ = await aget_user_obj(context.author)
         embed = discord.Embed(
             title=f'[{str(context.author)}]\'s Provable Fairness Information',
             color=settings.EMBED_DEFAULT_COLOR
@@ -111,7 +123,7 @@ class ProvableFairnessCommands(commands.Cog):
             inline=False
         )
         embed.set_thumbnail(url=context.author.avatar_url)
-        await context.send(embed=embed)
+        await context.say_as_embed(embed=embed)
 
     @commands.command(name='newseed', help=_pfair_newseed_help, brief=_pfair_newseed_brief)
     async def _generate_new_seed(self, context, *, new_seed=None):
@@ -124,7 +136,7 @@ class ProvableFairnessCommands(commands.Cog):
             )
             return
 
-        user_obj, _ = get_user_obj(context.author)
+        user_obj, _ = await aget_user_obj(context.author)
 
         embed = discord.Embed(
             title=f'{str(context.author)}, you are about to update your Provable Fairness Information',
@@ -162,7 +174,7 @@ class ProvableFairnessCommands(commands.Cog):
         user_obj.user_seed = new_seed
         user_obj.server_seed = generate_server_seed()
         user_obj.nonce = 0
-        user_obj.save()
+        await run_in_db_thread(user_obj.save)
 
         embed = discord.Embed(
             title=f'Provable Fairness Information for {str(context.author)} updated',
@@ -1,5 +1,6 @@
 from discord.ext import commands
-from db.apps.giveaways.models import Giveaway
+from db.apps.giveaways.models import ArchivedGiveaway, Giveaway
+from utils.db import run_in_db_thread
 
 
 class PositiveNumberConverter(commands.Converter):
@@ -19,12 +20,15 @@ class OwnedGiveawayConverted(commands.Converter):
     async def convert(self, context, argument):
         argument = await PositiveNumberConverter().convert(context, argument)
 
-        try:
-            ga_obj = Giveaway.objects.get(
-                creator__discord_id=context.author.id,
-                id=argument,
-            )
-        except Giveaway.DoesNotExist:
-            raise commands.BadArgument(f'Giveaway with ID `{argument}` does not exist, or you are not its creator.')
-
-        return ga_obj
+        # archived giveaways keep their IDs, so they are looked up second
+        for model in (Giveaway, ArchivedGiveaway):
+            try:
+                return await run_in_db_thread(
+                    model.objects.select_related('creator', 'guild').get,
+                    creator__discord_id=context.author.id,
+                    id=argument,
+                )
+            except model.DoesNotExist:
+                continue
+
+        raise commands.BadArgument(f'Giveaway with ID `{argument}` does not exist, or you are not its creator.')
@@ -0,0 +1,116 @@
+import asyncio
+import traceback
+
+from django.conf import settings
+
+from db.apps.giveaways.models import Entrant, GiveawayEntry
+from utils.db import run_in_db_thread
+
+
+class EntrantTracker(object):
+    """
+    Keeps the entrants of on going giveaways up to date from raw reaction add / remove events,
+    so ending a giveaway doesn't have to page through all of its reactions.
+    Changes are buffered and written to `GiveawayEntry` by `flush()`.
+    """
+
+    def __init__(self):
+        # message ID -> giveaway ID of the tracked giveaways
+        self._giveaways = {}
+        # giveaway ID -> {Discord ID: `Entrant`, or None once unreacted}, the latest event wins
+        self._pending = {}
+        # IDs of the giveaways someone unknown (who may be a bot) reacted to since the last flush
+        self._unverified = set()
+        # held while changes are written, so that `flush()` returns after the changes taken before it are written
+        self._flush_lock = asyncio.Lock()
+
+    def __len__(self):
+        return len(self._giveaways)
+
+    def load(self, ga_objs):
+        """Tracks `ga_objs` on top of the giveaways tracked while they were queried."""
+        for ga_obj in ga_objs:
+            if ga_obj.message_id:
+                self._giveaways.setdefault(ga_obj.message_id, ga_obj.id)
+
+    def track(self, ga_obj):
+        self._giveaways[ga_obj.message_id] = ga_obj.id
+
+    def tracks(self, message_id):
+        return message_id in self._giveaways
+
+    def untrack(self, ga_obj):
+        self._giveaways.pop(ga_obj.message_id, None)
+        self._pending.pop(ga_obj.id, None)
+        self._unverified.discard(ga_obj.id)
+
+    def handle_reaction(self, message_id, user_id, emoji_id, discord_user, added):
+        """
+        Buffers the entrant change of a reaction event.
+        `discord_user` is the user who reacted, from the cache or the event itself, or None if it is unknown.
+        """
+        if emoji_id != settings.REACT_EMOJI_ID:
+            return
+
+        ga_id = self._giveaways.get(message_id)
+        if ga_id is None:
+            return
+
+        # bots (the giveaway bot's own reaction included) never enter
+        if discord_user is not None and discord_user.bot:
+            return
+
+        # reactions added in a server come with their member, so this only happens if Discord leaves it out:
+        # the entry is kept, but the giveaway's entrants are scraped when it ends, which skips bots
+        if discord_user is None and added:
+            self._unverified.add(ga_id)
+
+        entrant = None
+        if added:
+            # names of unknown users are fetched for winners only, when the giveaway ends
+            entrant = Entrant(
+                user_id,
+                discord_user.name if discord_user else '',
+                discord_user.discriminator if discord_user else '',
+            )
+        self._pending.setdefault(ga_id, {})[user_id] = entrant
+
+    async def flush(self, ga_id=None):
+        """
+        Writes the buffered changes (of the giveaway with `ga_id` only, if given) to the database.
+        Changes another flush took already are written too when it returns.
+        """
+        async with self._flush_lock:
+            await self._flush(ga_id)
+
+    async def _flush(self, ga_id):
+        if ga_id is None:
+            changes, self._pending = self._pending, {}
+            unverified_ids, self._unverified = self._unverified, set()
+        elif ga_id in self._pending:
+            changes = {ga_id: self._pending.pop(ga_id)}
+            unverified_ids = {ga_id} & self._unverified
+            self._unverified -= unverified_ids
+        else:
+            return
+
+        if not changes:
+            return
+
+        try:
+            await run_in_db_thread(GiveawayEntry.objects.apply_changes, changes, unverified_ids)
+        except Exception:
+            self._unverified |= unverified_ids
+            # put the changes back for the next flush, behind the events received since
+            for _ga_id, entrants in changes.items():
+                pending = self._pending.setdefault(_ga_id, {})
+                for discord_id, entrant in entrants.items():
+                    pending.setdefault(discord_id, entrant)
+            raise
+
+    async def flush_all(self):
+        try:
+            await self.flush()
+        except Exception:
+            print('[Track Giveaway Entrants] Writing entrants failed:')
+            traceback.print_exc()
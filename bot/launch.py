@@ -14,6 +14,7 @@ def launcher():
         'bot.cogs.pfair',
 
         'bot.tasks.giveawaytask',
+        'bot.tasks.entranttask',
 
     )
     for extension in initial_extensions:
@@ -0,0 +1,151 @@
+import asyncio
+import heapq
+import itertools
+
+# lower goes first
+PRIORITY_ANNOUNCEMENT = 0
+PRIORITY_REPLY = 1
+PRIORITY_REACTION = 2
+PRIORITY_REFRESH = 3
+
+
+class OutboundRequest(object):
+
+    def __init__(self, factory, priority, merge_key, future):
+        self.factory = factory
+        self.priority = priority
+        self.merge_key = merge_key
+        self.future = future
+        # set when a newer request to the same `merge_key` replaced this one before it was sent
+        self.superseded = False
+
+
+class OutboundScheduler(object):
+    """
+    Sends the bot's Discord writes (messages, edits, reactions) through one queue per route.
+    Routes are channels, which is how Discord buckets message writes: each route sends one request
+    at a time, highest priority first, so winner announcements and command replies never wait behind
+    queued embed refreshes. Rate limits (429s and exhausted buckets) are waited out by discord.py
+    while the request is in flight, the rest of the route's requests wait here, in priority order.
+    An edit queued for a message that already has an unsent edit replaces it.
+    """
+
+    def __init__(self, loop=None):
+        self.loop = loop or asyncio.get_event_loop()
+        # route -> heap of (priority, sequence, OutboundRequest)
+        self._queues = {}
+        # route -> task sending its queue
+        self._workers = {}
+        # (route, merge key) -> OutboundRequest not sent yet
+        self._mergeable = {}
+        self._counter = itertools.count()
+
+    def __len__(self):
+        return sum(len(queue) for queue in self._queues.values())
+
+    def submit(self, route, factory, priority=PRIORITY_REPLY, merge_key=None):
+        """
+        Queues `factory()` (a function returning the request's coroutine) on `route`.
+        Returns a future of its result. Requests with the same `merge_key` on a route supersede
+        each other while unsent, the superseded ones resolve with the newest one's result.
+        """
+        future = self.loop.create_future()
+        request = OutboundRequest(factory, priority, merge_key, future)
+
+        if merge_key is not None:
+            previous = self._mergeable.get((route, merge_key))
+            if previous is not None:
+                previous.superseded = True
+                # the merged request keeps the most urgent priority of the two
+                request.priority = min(request.priority, previous.priority)
+                future.add_done_callback(lambda done: self._chain(done, previous.future))
+            self._mergeable[(route, merge_key)] = request
+
+        heapq.heappush(self._queues.setdefault(route, []), (request.priority, next(self._counter), request))
+
+        if route not in self._workers:
+            self._workers[route] = self.loop.create_task(self._run(route))
+
+        return future
+
+    @staticmethod
+    def _chain(source, target):
+        if target.done():
+            return
+        if source.cancelled():
+            target.cancel()
+        elif source.exception() is not None:
+            target.set_exception(source.exception())
+        else:
+            target.set_result(source.result())
+
+    async def _run(self, route):
+        queue = self._queues[route]
+        try:
+            while queue:
+                _, _, request = heapq.heappop(queue)
+                if request.merge_key is not None and self._mergeable.get((route, request.merge_key)) is request:
+                    del self._mergeable[(route, request.merge_key)]
+
+                # replaced by a newer request, or its caller stopped waiting
+                if request.superseded or request.future.done():
+                    continue
+
+                try:
+                    result = await request.factory()
+                except asyncio.CancelledError:
+                    request.future.cancel()
+                    raise
+                except Exception as error:
+                    if not request.future.done():
+                        request.future.set_exception(error)
+                else:
+                    if not request.future.done():
+                        request.future.set_result(result)
+        finally:
+            # forget idle routes so the dicts don't grow with every channel ever written to
+            del self._workers[route]
+            if not queue:
+                del self._queues[route]
+
+    @staticmethod
+    def route_of(destination):
+        """Returns the route of a channel or a Context."""
+        return getattr(destination, 'channel', destination).id
+
+    def send(self, destination, priority=PRIORITY_REPLY, **kwargs):
+        """Queues `destination.send(**kwargs)`, `destination` being a channel or a Context."""
+        return self.submit(
+            self.route_of(destination),
+            lambda: destination.send(**kwargs),
+            priority=priority,
+        )
+
+    def edit(self, message, priority=PRIORITY_ANNOUNCEMENT, **kwargs):
+        """Queues `message.edit(**kwargs)`, replacing any unsent edit of `message`."""
+        return self.submit(
+            message.channel.id,
+            lambda: message.edit(**kwargs),
+            priority=priority,
+            merge_key=message.id,
+        )
+
+    def edit_message(self, http, channel_id, message_id, priority=PRIORITY_REFRESH, **fields):
+        """Queues an edit of a message by its IDs, without its Message object, replacing any unsent edit of it."""
+        return self.submit(
+            channel_id,
+            lambda: http.edit_message(channel_id, message_id, **fields),
+            priority=priority,
+            merge_key=message_id,
+        )
+
+    def add_reaction(self, message, emoji, priority=PRIORITY_REACTION):
+        return self.submit(
+            message.channel.id,
+            lambda: message.add_reaction(emoji),
+            priority=priority,
+        )
+
+    def close(self):
+        for worker in self._workers.values():
+            worker.cancel()
@@ -0,0 +1,72 @@
+import asyncio
+
+
+class PromptDispatcher(object):
+    """
+    Pending `validate_input` prompts, indexed by (channel ID, author ID), and by author ID for DM-only prompts.
+    `dispatch()` matches an incoming message with one dict lookup, instead of discord.py running
+    the check of every pending `wait_for` against every message.
+    """
+
+    def __init__(self, loop=None):
+        self.loop = loop or asyncio.get_event_loop()
+        # (channel ID, author ID) -> list of (check, future)
+        self._prompts = {}
+        # author ID -> list of (check, future), for prompts answered in any DM channel
+        self._dm_prompts = {}
+
+    def __len__(self):
+        return len({id(prompt) for prompts in self._prompts.values() for prompt in prompts}) + \
+            len({id(prompt) for prompts in self._dm_prompts.values() for prompt in prompts})
+
+    def _register(self, prompt, channel_id, author_ids):
+        for author_id in author_ids:
+            if channel_id is None:
+                self._dm_prompts.setdefault(author_id, []).append(prompt)
+            else:
+                self._prompts.setdefault((channel_id, author_id), []).append(prompt)
+
+    def _unregister(self, prompt, channel_id, author_ids):
+        for author_id in author_ids:
+            index = self._dm_prompts if channel_id is None else self._prompts
+            key = author_id if channel_id is None else (channel_id, author_id)
+
+            prompts = index.get(key, [])
+            if prompt in prompts:
+                prompts.remove(prompt)
+            if not prompts:
+                index.pop(key, None)
+
+    async def wait_for(self, author_ids, check, timeout=None, channel_id=None):
+        """
+        Waits for a message by one of `author_ids` in the channel with `channel_id`
+        (or in any DM channel if it's None) that passes `check`, and returns it.
+        Raises asyncio.TimeoutError after `timeout` seconds, like `Client.wait_for`.
+        """
+        future = self.loop.create_future()
+        prompt = (check, future)
+
+        self._register(prompt, channel_id, author_ids)
+        try:
+            return await asyncio.wait_for(future, timeout)
+        finally:
+            self._unregister(prompt, channel_id, author_ids)
+
+    def dispatch(self, message):
+        """Resolves the pending prompts `message` answers."""
+        prompts = self._prompts.get((message.channel.id, message.author.id), [])
+        if message.guild is None:
+            prompts = prompts + self._dm_prompts.get(message.author.id, [])
+
+        for check, future in list(prompts):
+            if future.done():
+                continue
+
+            try:
+                passed = check(message)
+            except Exception as error:
+                future.set_exception(error)
+                continue
+
+            if passed:
+                future.set_result(message)
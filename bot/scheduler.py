@@ -0,0 +1,172 @@
+import asyncio
+import heapq
+import itertools
+import time
+
+from utils.time import next_remaining_time_refresh
+
+
+class GiveawayScheduler(object):
+    """
+    Keeps ongoing giveaways in a priority queue keyed by the time they next need
+    attention: their `ending_at`, or the next time the shown time remaining changes if that comes first.
+    `wait_for_due()` sleeps until the earliest deadline instead of polling the database.
+    """
+
+    def __init__(self, retry_delay):
+        self.retry_delay = retry_delay
+
+        # heap of (due timestamp, sequence, giveaway ID)
+        self._heap = []
+        # giveaway ID -> sequence of its latest heap entry, older entries are stale
+        self._sequences = {}
+        # giveaway ID -> Giveaway object
+        self._giveaways = {}
+        self._counter = itertools.count()
+        self._wakeup = asyncio.Event()
+
+    def __len__(self):
+        return len(self._giveaways)
+
+    def __contains__(self, ga_id):
+        return ga_id in self._giveaways
+
+    def load(self, ga_objs):
+        """
+        Schedules `ga_objs` on top of the scheduled giveaways.
+        Giveaways already scheduled are kept as they are, they were scheduled while `ga_objs` was queried.
+        """
+        for ga_obj in ga_objs:
+            if ga_obj.id not in self._giveaways:
+                self.schedule(ga_obj)
+
+    def next_due(self, ga_obj):
+        """Returns the timestamp `ga_obj` needs attention at next."""
+        now = time.time()
+        ending_at = ga_obj.ending_at.timestamp()
+        return min(ending_at, now + next_remaining_time_refresh(ending_at - now))
+
+    def schedule(self, ga_obj, due=None):
+        """(Re)schedules `ga_obj`, replacing any previous deadline it had."""
+        if due is None:
+            due = self.next_due(ga_obj)
+
+        sequence = next(self._counter)
+        self._sequences[ga_obj.id] = sequence
+        self._giveaways[ga_obj.id] = ga_obj
+        heapq.heappush(self._heap, (due, sequence, ga_obj.id))
+
+        # the new deadline may be earlier than the one being slept on
+        self._wakeup.set()
+
+    def schedule_retry(self, ga_obj):
+        """Schedules `ga_obj` one retry delay from now, even if it's past its `ending_at`."""
+        self.schedule(ga_obj, due=time.time() + self.retry_delay)
+
+    def unschedule(self, ga_id):
+        """Removes the giveaway with `ga_id`. Its heap entry is dropped lazily."""
+        self._sequences.pop(ga_id, None)
+        self._giveaways.pop(ga_id, None)
+
+    def _drop_stale(self):
+        while self._heap:
+            _, sequence, ga_id = self._heap[0]
+            if self._sequences.get(ga_id) == sequence:
+                return
+            heapq.heappop(self._heap)
+
+    def _pop_due(self, now):
+        due_objs = []
+        while self._heap and self._heap[0][0] <= now:
+            _, sequence, ga_id = heapq.heappop(self._heap)
+            if self._sequences.get(ga_id) != sequence:
+                continue
+            del self._sequences[ga_id]
+            due_objs.append(self._giveaways.pop(ga_id))
+
+        return due_objs
+
+    async def wait_for_due(self):
+        """
+        Sleeps until at least one giveaway is due, then returns all due giveaways.
+        Returned giveaways are no longer scheduled, `schedule()` them again if they're still on going.
+        """
+        while True:
+            self._wakeup.clear()
+            self._drop_stale()
+
+            if not self._heap:
+                await self._wakeup.wait()
+                continue
+
+            now = time.time()
+            delay = self._heap[0][0] - now
+            if delay <= 0:
+                return self._pop_due(now)
+
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=delay)
+            except asyncio.TimeoutError:
+                pass
+
+
+class GiveawayWorkerPool(object):
+    """
+    Runs giveaway jobs concurrently, with at most `limit` jobs at once overall,
+    `per_channel` jobs in the same channel and `per_guild` jobs in the same guild.
+    """
+
+    def __init__(self, limit, per_channel, per_guild):
+        self.per_channel = per_channel
+        self.per_guild = per_guild
+
+        self._global = asyncio.Semaphore(limit)
+        # key -> [Semaphore, number of jobs using it]
+        self._channels = {}
+        self._guilds = {}
+
+    @staticmethod
+    def _acquire_slot(slots, key, limit):
+        if key not in slots:
+            slots[key] = [asyncio.Semaphore(limit), 0]
+        slots[key][1] += 1
+        return slots[key][0]
+
+    @staticmethod
+    def _release_slot(slots, key):
+        slots[key][1] -= 1
+        # forget idle keys so the dicts don't grow with every channel ever seen
+        if slots[key][1] == 0:
+            del slots[key]
+
+    async def run(self, ga_obj, job):
+        """Awaits `job(ga_obj)` once a global, channel and guild slot are free."""
+        channel_key = ga_obj.channel_id
+        guild_key = ga_obj.guild_id
+
+        guild_semaphore = self._acquire_slot(self._guilds, guild_key, self.per_guild)
+        channel_semaphore = self._acquire_slot(self._channels, channel_key, self.per_channel)
+        try:
+            # always acquired in the same order, and the global slot last so that
+            # jobs queued behind a busy channel don't hold it
+            async with guild_semaphore:
+                async with channel_semaphore:
+                    async with self._global:
+                        return await job(ga_obj)
+        finally:
+            self._release_slot(self._channels, channel_key)
+            self._release_slot(self._guilds, guild_key)
+
+    async def run_all(self, ga_objs, job):
+        """
+        Runs `job` for every object in `ga_objs`.
+        Returns a list of (Giveaway, result or raised exception) and the duration in seconds.
+        """
+        started_at = time.monotonic()
+
+        results = await asyncio.gather(
+            *[self.run(ga_obj, job) for ga_obj in ga_objs],
+            return_exceptions=True
+        )
+
+        return list(zip(ga_objs, results)), time.monotonic() - started_at
@@ -0,0 +1,78 @@
+import discord
+from discord.ext import commands, tasks
+from django.conf import settings
+
+from db.apps.giveaways.models import Giveaway
+from utils.db import run_in_db_thread
+
+
+class TrackGiveawayEntrants(commands.Cog):
+
+    def __init__(self, bot):
+        self.bot = bot
+        self.tracker = bot.entrant_tracker
+        self.flush_entrants.start()
+
+        # the raw reaction add payload of a server message has the member who reacted, which discord.py 1.2
+        # doesn't pass on: with it, reactors are known even when they aren't cached (see the low-memory mode)
+        state = bot._connection
+        self.parse_reaction_add = state.parsers['MESSAGE_REACTION_ADD']
+        state.parsers['MESSAGE_REACTION_ADD'] = self.on_reaction_add_data
+
+    def cog_unload(self):
+        self.flush_entrants.cancel()
+        self.bot._connection.parsers['MESSAGE_REACTION_ADD'] = self.parse_reaction_add
+
+    def on_reaction_add_data(self, data):
+        message_id = int(data['message_id'])
+        if self.tracker.tracks(message_id):
+            user_id = int(data['user_id'])
+            emoji_id = data['emoji'].get('id')
+
+            discord_user = self.bot.get_user(user_id)
+            user_data = (data.get('member') or {}).get('user')
+            if discord_user is None and user_data is not None:
+                discord_user = discord.User(state=self.bot._connection, data=user_data)
+
+            self.tracker.handle_reaction(
+                message_id, user_id, int(emoji_id) if emoji_id else None, discord_user, added=True
+            )
+
+        self.parse_reaction_add(data)
+
+    @commands.Cog.listener()
+    async def on_ready(self):
+        # a new gateway session (not a resumed one) missed the reactions made while the bot was away,
+        # so the entrants of on going giveaways are scraped when they end
+        await run_in_db_thread(lambda: Giveaway.objects.filter(success=None).update(entries_complete=False))
+
+    @commands.Cog.listener()
+    async def on_raw_reaction_remove(self, payload):
+        self.tracker.handle_reaction(
+            payload.message_id, payload.user_id, payload.emoji.id, self.bot.get_user(payload.user_id), added=False
+        )
+
+    @tasks.loop(seconds=settings.ENTRANT_FLUSH_INTERVAL)
+    async def flush_entrants(self):
+        await self.tracker.flush_all()
+
+    @flush_entrants.after_loop
+    async def after_flush_entrants(self):
+        # don't lose the last buffered changes on unload
+        await self.tracker.flush_all()
+
+    @flush_entrants.before_loop
+    async def before_flush_entrants(self):
+        print('[Track Giveaway Entrants] Waiting for ready state...')
+
+        await self.bot.wait_until_ready()
+
+        self.tracker.load(await run_in_db_thread(
+            lambda: list(Giveaway.objects.filter(success=None).only('id', 'message_id'))
+        ))
+
+        print(f'[Track Giveaway Entrants] Ready and running! ({len(self.tracker)} tracked giveaways)')
+
+
+def setup(bot):
+    bot.add_cog(TrackGiveawayEntrants(bot))
@@ -1,28 +1,72 @@
+import traceback
+
 from discord.ext import commands, tasks
 from django.conf import settings
 
+from bot.scheduler import GiveawayWorkerPool
 from db.apps.giveaways.models import Giveaway
+from utils.db import run_in_db_thread
 
 
 class UpdateGiveawayTimeRemaining(commands.Cog):
 
     def __init__(self, bot):
         self.bot = bot
+        self.scheduler = bot.giveaway_scheduler
+        self.pool = GiveawayWorkerPool(
+            limit=settings.GIVEAWAY_WORKER_CONCURRENCY,
+            per_channel=settings.GIVEAWAY_WORKER_CHANNEL_CONCURRENCY,
+            per_guild=settings.GIVEAWAY_WORKER_GUILD_CONCURRENCY,
+        )
+        # batches of due giveaways being processed
+        self.running_ticks = set()
+        self.last_tick_duration = None
         self.update_giveaway_time_remaining.start()
 
     def cog_unload(self):
         self.update_giveaway_time_remaining.cancel()
+        for tick in self.running_ticks:
+            tick.cancel()
 
-    @tasks.loop(seconds=settings.UPDATE_GIVEAWAY_REMAINING_TIME_DELAY if not settings.DEBUG else 5)
-    async def update_giveaway_time_remaining(self):
-        ga_objs = Giveaway.objects.filter(success=None)
-
-        if not ga_objs.exists():
+    async def process_giveaway(self, ga_obj):
+        ga_obj.bot = self.bot
+        try:
+            await ga_obj.end(for_task=True)
+        except Giveaway.DoesNotExist:
+            # deleted by a command in the meantime, nothing to retry
+            self.scheduler.unschedule(ga_obj.id)
+            self.bot.entrant_tracker.untrack(ga_obj)
             return
 
-        for ga_obj in ga_objs:
-            ga_obj.bot = self.bot
-            await ga_obj.end(for_task=True)
+        # still on going, wait for its next deadline
+        if ga_obj.success is None:
+            self.scheduler.schedule(ga_obj)
+        else:
+            self.bot.entrant_tracker.untrack(ga_obj)
+
+    async def tick(self, ga_objs):
+        results, duration = await self.pool.run_all(ga_objs, self.process_giveaway)
+        self.last_tick_duration = duration
+
+        for ga_obj, result in results:
+            if isinstance(result, Exception):
+                print(f'[Update Giveaway Time Remaining] Giveaway ID [{ga_obj.id}] raised an exception:')
+                traceback.print_exception(type(result), result, result.__traceback__)
+                self.scheduler.schedule_retry(ga_obj)
+
+        if settings.DEBUG or duration >= 1:
+            print(f'[Update Giveaway Time Remaining] Processed {len(results)} giveaways in {duration:.2f}s')
+
+    @tasks.loop(seconds=0)
+    async def update_giveaway_time_remaining(self):
+        # sleeps until the next giveaway deadline
+        ga_objs = await self.scheduler.wait_for_due()
+
+        # due giveaways are processed in the background, so a slow batch
+        # doesn't hold back the deadlines coming after it
+        tick = self.bot.loop.create_task(self.tick(ga_objs))
+        self.running_ticks.add(tick)
+        tick.add_done_callback(self.running_ticks.discard)
 
     @update_giveaway_time_remaining.before_loop
     async def before_execute_timed_events_task(self):
@@ -30,7 +74,9 @@ class UpdateGiveawayTimeRemaining(commands.Cog):
 
         await self.bot.wait_until_ready()
 
-        print('[Update Giveaway Time Remaining] Ready and running!')
+        self.scheduler.load(await run_in_db_thread(lambda: list(Giveaway.objects.filter(success=None).order_by('ending_at'))))
+
+        print(f'[Update Giveaway Time Remaining] Ready and running! ({len(self.scheduler)} on going giveaways)')
 
 
 def setup(bot):
@@ -37,34 +37,24 @@ async def validate_input(context, inputs, **kwargs):
     else:
         prefixed_command = f'{context.prefix}{context.invoked_with}'
 
+    # the channel and the author are matched by the prompt dispatcher, see bot/prompts.py
     def message_checker(message):
-        if only_dm:
-            if message.guild is not None:
-                return False
-
-            if message.content.lower() in PREDEFINED_RESPONSES + [prefixed_command, ] and allow_cancel:
-                return True
-            elif inputs is None:
-                return True
-            elif message.content.lower() in inputs:
-                return True
-
-            return False
-
-        if message.channel == context.channel and message.author in authors:
-            if message.content.lower() in PREDEFINED_RESPONSES + [prefixed_command, ] and allow_cancel:
-                return True
-            elif inputs is None:
-                return True
-            elif message.content.lower() in inputs and len(message.content) <= max_length:
-                return True
-
-            return False
+        if message.content.lower() in PREDEFINED_RESPONSES + [prefixed_command, ] and allow_cancel:
+            return True
+        elif inputs is None:
+            return True
+        elif message.content.lower() in inputs and (only_dm or len(message.content) <= max_length):
+            return True
 
         return False
 
     try:
-        response = await context.bot.wait_for('message', check=message_checker, timeout=timeout)
+        response = await context.bot.prompts.wait_for(
+            [author.id for author in authors],
+            message_checker,
+            timeout=timeout,
+            channel_id=None if only_dm else context.channel.id,
+        )
     except asyncio.TimeoutError:
         await context.say_as_embed(
             f'You took too long to respond, please type `{prefixed_command}` to start over.', color='warning')
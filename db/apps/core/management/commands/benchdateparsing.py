@@ -0,0 +1,84 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from utils.dates import dateparser_parse, fast_parse, parse_spec
+
+# inputs of the create wizard's end time step that `fast_parse` understands
+FAST_INPUTS = (
+    'in 10 hours and 30 minutes',
+    'in 2 days',
+    '45 minutes from now',
+    'in an hour',
+    'in 1 week, 2 days and 3 hours',
+    '2030-06-24',
+    'June 24th, 2030',
+    '24 June 2030 PDT',
+    '2030-06-24 10:00',
+    '2030-06-24T10:00:00Z',
+    '10AM June 24th, 2030 PDT',
+    'June 24th 2030 10:30pm EST',
+    '24 June 2030 22:00',
+)
+
+# inputs left to dateparser
+FALLBACK_INPUTS = (
+    'tomorrow at noon',
+    'next friday 5pm',
+    '24 juin 2030 10:00',
+    # a past time for dateparser
+    '45 minutes',
+)
+
+# seconds the two parsers may disagree by, they don't read the clock at the same time
+# (inputs without timezone are compared in UTC, run it on a machine whose local timezone is UTC like the bot's)
+TOLERANCE = 5
+
+
+class Command(BaseCommand):
+    help = 'Times the fast date time parser against dateparser and checks both read the common formats the same.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--repeat', type=int, default=1000,
+            help='Number of times every fast path input is parsed (default: 1000).'
+        )
+
+    @staticmethod
+    def time_parse(parse, inputs, repeat=1):
+        started_at = time.perf_counter()
+        for _ in range(repeat):
+            for text in inputs:
+                parse(text)
+        return (time.perf_counter() - started_at) / (repeat * len(inputs))
+
+    def handle(self, *args, **options):
+        repeat = options['repeat']
+
+        failed = []
+        for text in FAST_INPUTS:
+            parsed_dt, expected_dt = fast_parse(text), dateparser_parse(text)
+            if parsed_dt is None or expected_dt is None or abs((parsed_dt - expected_dt).total_seconds()) > TOLERANCE:
+                failed.append(text)
+                self.stdout.write(self.style.ERROR(f'[MISMATCH] "{text}": {parsed_dt} (dateparser: {expected_dt})'))
+
+        for text in FALLBACK_INPUTS:
+            if fast_parse(text) is not None:
+                failed.append(text)
+                self.stdout.write(self.style.ERROR(f'[NOT FALLING BACK] "{text}": {fast_parse(text)}'))
+
+        if failed:
+            raise CommandError(f'{len(failed)} inputs parsed differently.')
+
+        parse_spec.cache_clear()
+        cold = self.time_parse(fast_parse, FAST_INPUTS)
+        cached = self.time_parse(fast_parse, FAST_INPUTS, repeat)
+        # dateparser is warm already, the checks above loaded its data
+        dateparser_fast_inputs = self.time_parse(dateparser_parse, FAST_INPUTS)
+        dateparser_fallback_inputs = self.time_parse(dateparser_parse, FALLBACK_INPUTS)
+
+        self.stdout.write(self.style.SUCCESS(
+            f'[OK] fast path: {cold * 1000:.3f}ms per input uncached, {cached * 1000:.3f}ms cached '
+            f'(dateparser: {dateparser_fast_inputs * 1000:.2f}ms on the same inputs, '
+            f'{dateparser_fallback_inputs * 1000:.2f}ms on the fallback inputs)'
+        ))
@@ -0,0 +1,137 @@
+import gc
+import json
+import os
+import resource
+import subprocess
+import sys
+
+from django.core.management.base import BaseCommand
+
+MODES = ('default', 'low-memory')
+
+
+def rss_bytes():
+    """Returns the resident set size of this process."""
+    try:
+        with open('/proc/self/statm') as statm:
+            return int(statm.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except OSError:
+        # peak instead of current RSS, in kilobytes on Linux but bytes on macOS
+        max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return max_rss if sys.platform == 'darwin' else max_rss * 1024
+
+
+def user_payload(user_id, bot=False):
+    return {'id': str(user_id), 'username': f'User{user_id}', 'discriminator': f'{user_id % 10000:04}', 'avatar': None, 'bot': bot}
+
+
+def guild_payload(guild_id, member_count, channel_count, bot_id):
+    """A GUILD_CREATE payload like Discord sends for a guild of `member_count` members, all online."""
+    member_ids = [bot_id] + [guild_id * 100000 + n for n in range(1, member_count)]
+    return {
+        'id': str(guild_id),
+        'name': f'Guild {guild_id}',
+        'unavailable': False,
+        'large': False,
+        'member_count': member_count,
+        'owner_id': str(member_ids[-1]),
+        'region': 'us-east',
+        'verification_level': 0,
+        'default_message_notifications': 0,
+        'explicit_content_filter': 0,
+        'mfa_level': 0,
+        'features': [],
+        'emojis': [],
+        'voice_states': [],
+        'roles': [{
+            'id': str(guild_id), 'name': '@everyone', 'permissions': 104324161, 'position': 0,
+            'color': 0, 'hoist': False, 'managed': False, 'mentionable': False,
+        }],
+        'channels': [
+            {
+                'id': str(guild_id * 1000 + n), 'type': 0, 'name': f'channel-{n}', 'position': n,
+                'permission_overwrites': [], 'topic': None, 'nsfw': False, 'parent_id': None, 'rate_limit_per_user': 0,
+            }
+            for n in range(channel_count)
+        ],
+        'members': [
+            {
+                'user': user_payload(member_id, bot=member_id == bot_id), 'roles': [], 'nick': None,
+                'joined_at': '2019-06-24T00:00:00.000000+00:00', 'deaf': False, 'mute': False,
+            }
+            for member_id in member_ids
+        ],
+        'presences': [
+            {'user': {'id': str(member_id)}, 'status': 'online', 'game': None, 'activities': [], 'client_status': {}}
+            for member_id in member_ids
+        ],
+    }
+
+
+def message_payload(message_id, guild_id, author_id):
+    return {
+        'id': str(message_id), 'channel_id': str(guild_id * 1000), 'guild_id': str(guild_id), 'type': 0,
+        'author': user_payload(author_id), 'content': 'x' * 100, 'timestamp': '2019-06-24T00:00:00.000000+00:00',
+        'edited_timestamp': None, 'tts': False, 'mention_everyone': False, 'mentions': [], 'mention_roles': [],
+        'attachments': [], 'embeds': [], 'pinned': False,
+    }
+
+
+class Command(BaseCommand):
+    help = (
+        'Loads synthetic guild payloads into the bot\'s gateway state, in the default and the low-memory mode, '
+        'and reports the resident memory (RSS) per 1k guilds.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--guilds', type=int, default=1000, help='Number of guilds (default: 1000).')
+        parser.add_argument('--members', type=int, default=200, help='Members (all online) per guild (default: 200).')
+        parser.add_argument('--channels', type=int, default=10, help='Text channels per guild (default: 10).')
+        parser.add_argument('--messages', type=int, default=20, help='Messages received per guild (default: 20).')
+        parser.add_argument('--mode', choices=MODES, help='Measure a single mode in this process (used internally).')
+
+    def measure(self, low_memory, options):
+        # imported here so that measuring starts from a process without the bot's state
+        from discord.user import ClientUser
+        from bot.bot import CustomBot
+
+        bot = CustomBot(low_memory=low_memory)
+        state = bot._connection
+        # events are only parsed into the state, never dispatched to the bot
+        state.dispatch = lambda event, *args, **kwargs: None
+        bot_id = 1
+        state.user = ClientUser(state=state, data=user_payload(bot_id, bot=True))
+
+        gc.collect()
+        rss_before = rss_bytes()
+
+        for guild_id in range(1, options['guilds'] + 1):
+            state.parsers['GUILD_CREATE'](guild_payload(guild_id, options['members'], options['channels'], bot_id))
+            for n in range(options['messages']):
+                state.parsers['MESSAGE_CREATE'](message_payload(guild_id * 1000000 + n, guild_id, guild_id * 100000 + 1))
+
+        gc.collect()
+        return {
+            'rss_per_1k_guilds': (rss_bytes() - rss_before) * 1000 / options['guilds'],
+            'cached_members': sum(len(guild.members) for guild in bot.guilds),
+            'cached_messages': len(bot.cached_messages),
+        }
+
+    def handle(self, *args, **options):
+        if options['mode']:
+            result = self.measure(options['mode'] == 'low-memory', options)
+            self.stdout.write(json.dumps(result))
+            return
+
+        # each mode in a fresh process, so that one doesn't reuse memory freed by the other
+        for mode in MODES:
+            output = subprocess.check_output([
+                sys.executable, sys.argv[0], 'benchgatewaymemory', '--mode', mode,
+                '--guilds', str(options['guilds']), '--members', str(options['members']),
+                '--channels', str(options['channels']), '--messages', str(options['messages']),
+            ])
+            result = json.loads(output.decode().strip().splitlines()[-1])
+            self.stdout.write(
+                f'{mode:>10}: {result["rss_per_1k_guilds"] / 1024 ** 2:.1f} MiB per 1k guilds '
+                f'({result["cached_members"]} cached members, {result["cached_messages"]} cached messages)'
+            )
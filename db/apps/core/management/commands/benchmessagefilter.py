@@ -0,0 +1,86 @@
+import random
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from .benchgatewaymemory import guild_payload, message_payload, user_payload
+
+GUILD_ID = 1
+BOT_ID = 1
+
+# (share of the messages, content, sent by a bot) of the traffic the bot sees, none of it a command
+TRAFFIC = (
+    (0.80, 'just chatting about the giveaway, good luck everyone', False),
+    (0.10, 'yes', False),
+    (0.08, 'Level up! You are now level 12.', True),
+    (0.02, '<@{other_id}> check this out', False),
+)
+
+
+class Command(BaseCommand):
+    help = (
+        'Times `CustomBot.on_message` on synthetic non-command messages, with and without the prefix pre-filter, '
+        'and checks the pre-filter never rejects a message that has the prefix.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--messages', type=int, default=100000, help='Number of messages (default: 100000).')
+
+    @staticmethod
+    def build_message(bot, message_id, content, from_bot=False):
+        import discord
+
+        author_id = GUILD_ID * 100000 + 1 + message_id % 100
+        payload = message_payload(message_id, GUILD_ID, author_id)
+        payload['author'] = user_payload(author_id, bot=from_bot)
+        payload['content'] = content.format(other_id=author_id + 1)
+        return discord.Message(state=bot._connection, channel=bot.get_channel(GUILD_ID * 1000), data=payload)
+
+    def build_messages(self, bot, count):
+        rng = random.Random(0)
+        shares, contents, from_bots = zip(*TRAFFIC)
+        kinds = list(zip(contents, from_bots))
+
+        return [
+            self.build_message(bot, n, *rng.choices(kinds, weights=shares)[0])
+            for n in range(count)
+        ]
+
+    @staticmethod
+    async def time_messages(handle, messages):
+        started_at = time.perf_counter()
+        for message in messages:
+            await handle(message)
+        return time.perf_counter() - started_at
+
+    def handle(self, *args, **options):
+        # imported here, the bot is only needed by this command
+        from discord.user import ClientUser
+        from bot.bot import CustomBot, CustomContext
+
+        bot = CustomBot()
+        state = bot._connection
+        state.dispatch = lambda event, *args, **kwargs: None
+        state.user = ClientUser(state=state, data=user_payload(BOT_ID, bot=True))
+        state.parsers['GUILD_CREATE'](guild_payload(GUILD_ID, 200, 1, BOT_ID))
+
+        prefix = bot.command_prefix
+        for content in (f'{prefix}help', f'{prefix}create', f'<@{BOT_ID}> help', f'<@!{BOT_ID}> help'):
+            if not bot.could_be_command(self.build_message(bot, 0, content)):
+                raise CommandError(f'The pre-filter rejects "{content}".')
+
+        messages = self.build_messages(bot, options['messages'])
+
+        async def unfiltered(message):
+            # `on_message` before the pre-filter
+            bot.prompts.dispatch(message)
+            ctx = await bot.get_context(message, cls=CustomContext)
+            await bot.invoke(ctx)
+
+        before = bot.loop.run_until_complete(self.time_messages(unfiltered, messages))
+        after = bot.loop.run_until_complete(self.time_messages(bot.on_message, messages))
+
+        self.stdout.write(self.style.SUCCESS(
+            f'[OK] {len(messages)} messages: {len(messages) / before:,.0f} messages/s without the pre-filter, '
+            f'{len(messages) / after:,.0f} messages/s with it ({before / after:.1f}x)'
+        ))
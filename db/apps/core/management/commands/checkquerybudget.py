@@ -0,0 +1,77 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from db.apps.giveaways.models import Giveaway, Winner
+from db.apps.guilds.models import DiscordGuild
+from db.apps.users.models import DiscordUser
+from utils.entrants import EntrantSet
+
+# (description, function rendering a Giveaway, maximum number of queries)
+RENDER_PATHS = (
+    ('Giveaway.embed', lambda ga_obj: ga_obj.embed, 1),
+    ('Giveaway.winners_discord', lambda ga_obj: ga_obj.winners_discord, 1),
+    ('Giveaway.info_text', lambda ga_obj: ga_obj.info_text, 1),
+    ('Giveaway.info_text (with_render_data)', lambda ga_obj: Giveaway.objects.with_render_data().get(id=ga_obj.id).info_text, 2),
+)
+
+# winner counts the render paths are measured with, their number of queries must not change
+WINNER_COUNTS = (1, 20)
+
+
+class Command(BaseCommand):
+    help = 'Fails if rendering a giveaway takes more queries than budgeted, or more queries with more winners.'
+
+    def create_ended_giveaway(self, winner_count):
+        # Discord IDs far away from real snowflakes, everything is rolled back anyway
+        users = [
+            DiscordUser.objects.create(discord_id=-(winner_count * 100 + n), name='Budget', discriminator='0000')
+            for n in range(winner_count)
+        ]
+        guild = DiscordGuild.objects.create(guild_id=-winner_count, name='Budget')
+
+        ga_obj = Giveaway.objects.create(
+            creator=users[0],
+            guild=guild,
+            prize='Budget',
+            winner_count=winner_count,
+            entrants_packed=EntrantSet(user.discord_id for user in users).pack(),
+            participant_count=winner_count,
+            winner_count_actual=winner_count,
+            ending_at=timezone.now(),
+            ended_at=timezone.now(),
+            success=True,
+        )
+        Winner.objects.bulk_create([Winner(giveaway=ga_obj, user=user, index=n, nonce=n) for n, user in enumerate(users)])
+
+        # a fresh object, like the ones the bot loads
+        return Giveaway.objects.select_related('creator', 'guild').get(id=ga_obj.id)
+
+    def handle(self, *args, **options):
+        failed = []
+
+        with transaction.atomic():
+            ga_objs = [self.create_ended_giveaway(winner_count) for winner_count in WINNER_COUNTS]
+
+            for description, render, budget in RENDER_PATHS:
+                query_counts = []
+                for ga_obj in ga_objs:
+                    with CaptureQueriesContext(connection) as queries:
+                        render(ga_obj)
+                    query_counts.append(len(queries))
+
+                counts_text = ', '.join(
+                    f'{count} queries with {winner_count} winners'
+                    for count, winner_count in zip(query_counts, WINNER_COUNTS)
+                )
+                if max(query_counts) > budget or len(set(query_counts)) > 1:
+                    failed.append(description)
+                    self.stdout.write(self.style.ERROR(f'[OVER BUDGET] {description}: {counts_text} (budget: {budget})'))
+                else:
+                    self.stdout.write(self.style.SUCCESS(f'[OK] {description}: {counts_text}'))
+
+            transaction.set_rollback(True)
+
+        if failed:
+            raise CommandError(f'Over query budget: {", ".join(failed)}')
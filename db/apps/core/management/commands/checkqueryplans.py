@@ -0,0 +1,39 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+
+from db.apps.giveaways.models import Giveaway
+from db.apps.guilds.models import DiscordGuild
+from db.apps.users.models import DiscordUser
+
+# (description, function returning the QuerySet) of queries the bot runs all the time
+HOT_QUERIES = (
+    ('get_user_obj', lambda: DiscordUser.objects.filter(discord_id=0)),
+    ('get_guild_obj', lambda: DiscordGuild.objects.filter(guild_id=0)),
+    ('Giveaway task', lambda: Giveaway.objects.filter(success=None).order_by('ending_at')),
+    ('OwnedGiveawayConverted', lambda: Giveaway.objects.filter(creator__discord_id=0, id=0)),
+)
+
+
+class Command(BaseCommand):
+    help = 'Fails if any hot query of the bot would be run with a sequential scan.'
+
+    def handle(self, *args, **options):
+        failed = []
+
+        with transaction.atomic():
+            # discourage sequential scans, so they only show up when no index can serve the query
+            # (on small tables Postgres would pick them anyway)
+            with connection.cursor() as cursor:
+                cursor.execute('SET LOCAL enable_seqscan = off')
+
+            for description, get_queryset in HOT_QUERIES:
+                plan = get_queryset().explain()
+
+                if 'Seq Scan' in plan:
+                    failed.append(description)
+                    self.stdout.write(self.style.ERROR(f'[SEQ SCAN] {description}\n{plan}\n'))
+                else:
+                    self.stdout.write(self.style.SUCCESS(f'[OK] {description}'))
+
+        if failed:
+            raise CommandError(f'Sequential scans in: {", ".join(failed)}')
@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import Giveaway, Winner
+from .models import ArchivedGiveaway, Giveaway, Winner
 
 
 class GiveawayAdmin(admin.ModelAdmin):
@@ -8,11 +8,17 @@ class GiveawayAdmin(admin.ModelAdmin):
         'creator',
         'prize',
         'winner_count',
+        'participant_count',
+        'winner_count_actual',
+        'draw_version',
         'status',
         'created_at',
         'ending_at',
         'ended_time_str',
         'success',
+        'entries_complete',
+        'collection_status',
+        'collected_count',
         'guild',
     )
 
@@ -24,5 +30,21 @@ class WinnerAdmin(admin.ModelAdmin):
         'nonce',
     )
 
+class ArchivedGiveawayAdmin(admin.ModelAdmin):
+    list_display = (
+        'id',
+        'creator',
+        'prize',
+        'winner_count',
+        'participant_count',
+        'winner_count_actual',
+        'draw_version',
+        'ended_at',
+        'archived_at',
+        'success',
+        'guild',
+    )
+
 admin.site.register(Winner, WinnerAdmin)
 admin.site.register(Giveaway, GiveawayAdmin)
+admin.site.register(ArchivedGiveaway, ArchivedGiveawayAdmin)
@@ -0,0 +1,30 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from db.apps.giveaways.models import ArchivedGiveaway
+
+
+class Command(BaseCommand):
+    help = 'Moves giveaways ended more than N days ago, with their winners and participants, to the archive tables.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--days', type=int, default=settings.GIVEAWAY_ARCHIVE_AFTER_DAYS,
+            help=f'Archive giveaways ended more than this many days ago (default: {settings.GIVEAWAY_ARCHIVE_AFTER_DAYS}).'
+        )
+        parser.add_argument(
+            '--batch-size', type=int, default=100,
+            help='Number of giveaways archived per transaction (default: 100).'
+        )
+
+    def handle(self, *args, **options):
+        ended_before = timezone.now() - timedelta(days=options['days'])
+
+        archived_count = ArchivedGiveaway.objects.archive(ended_before, batch_size=options['batch_size'])
+
+        self.stdout.write(self.style.SUCCESS(
+            f'Archived {archived_count} giveaways ended before {ended_before:%H:%M:%S %A %B %d, %Y (%Z)}.'
+        ))
@@ -0,0 +1,92 @@
+import random
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from utils.draw import DRAW_V1, DRAW_V2, WinnerSelector
+from utils.pfair import pfair_index
+
+
+class MemoryCreator(object):
+    """Provable Fairness Information of a creator kept in memory, so the benchmark doesn't touch the database."""
+
+    def __init__(self):
+        self.server_seed = 'benchmark-server-seed'
+        self.user_seed = 'benchmark-user-seed'
+        self.nonce = 0
+
+    def reserve_nonces(self, count):
+        self.nonce += count
+        return self.nonce - count
+
+    def pfair_randomize(self, index):
+        result = pfair_index(self.server_seed, self.user_seed, self.nonce, index)
+        self.nonce += 1
+        return result, self.nonce - 1
+
+
+def previous_loop(qualified_entries, winner_count, creator):
+    """The winner loop `Giveaway.end()` used before `WinnerSelector`: sorts on every draw, checks duplicates in a list."""
+    winners = []
+    while len(winners) < winner_count:
+        index, nonce = creator.pfair_randomize(len(qualified_entries))
+        sorted_entries = sorted(qualified_entries)
+
+        entry = (sorted_entries[index], index, nonce)
+        if entry[0] in [winner[0] for winner in winners]:
+            continue
+
+        winners.append(entry)
+
+    return winners
+
+
+def selector(qualified_entries, winner_count, creator):
+    return WinnerSelector(qualified_entries).select(winner_count, creator, DRAW_V1)
+
+
+def selector_v2(qualified_entries, winner_count, creator):
+    return WinnerSelector(qualified_entries).select(winner_count, creator, DRAW_V2)
+
+
+class Command(BaseCommand):
+    help = 'Times the winner selection against the previous loop and checks both pick the same (draw version 1) winners.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--entrants', type=int, nargs='+', default=[1000, 10000, 100000],
+            help='Numbers of entrants to draw among (default: 1000 10000 100000).'
+        )
+        parser.add_argument(
+            '--winners', type=int, default=20,
+            help='Number of winners drawn (default: 20).'
+        )
+
+    def time_draw(self, draw, qualified_entries, winner_count):
+        started_at = time.perf_counter()
+        winners = draw(qualified_entries, winner_count, MemoryCreator())
+        return winners, time.perf_counter() - started_at
+
+    def handle(self, *args, **options):
+        winner_count = options['winners']
+        rng = random.Random(0)
+
+        for entrant_count in options['entrants']:
+            if entrant_count <= winner_count:
+                raise CommandError('Every entrant would win, use more entrants than winners.')
+
+            # Discord snowflakes, in reaction order
+            qualified_entries = [rng.getrandbits(63) for _ in range(entrant_count)]
+
+            previous_winners, previous_duration = self.time_draw(previous_loop, qualified_entries, winner_count)
+            winners, duration = self.time_draw(selector, qualified_entries, winner_count)
+            _, duration_v2 = self.time_draw(selector_v2, qualified_entries, winner_count)
+
+            if winners != previous_winners:
+                raise CommandError(f'Different winners with {entrant_count} entrants.')
+
+            self.stdout.write(self.style.SUCCESS(
+                f'[OK] {entrant_count} entrants, {winner_count} winners: '
+                f'previous loop {previous_duration * 1000:.1f}ms, WinnerSelector {duration * 1000:.1f}ms '
+                f'(draw version 2: {duration_v2 * 1000:.1f}ms)'
+            ))
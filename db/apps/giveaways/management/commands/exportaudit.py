@@ -0,0 +1,103 @@
+import csv
+import hashlib
+
+from django.core.management.base import BaseCommand
+
+from db.apps.giveaways.models import ArchivedWinner, Winner
+from db.apps.users.models import DiscordUser
+
+# winners.csv and seeds.csv columns, as `audit.py` reads them
+WINNER_COLUMNS = (
+    'giveaway_id', 'draw_version', 'server_seed_hashed', 'user_seed',
+    'nonce', 'participant_count', 'winner_count', 'index',
+)
+SEED_COLUMNS = ('server_seed_hashed', 'server_seed')
+# number of server seeds looked up at once among the users' current ones
+SEED_LOOKUP_BATCH_SIZE = 1000
+
+
+class Command(BaseCommand):
+    help = (
+        'Exports the winners of ended giveaways (live and archived) and the revealed Server Seeds '
+        'they were drawn with, as the winners and seeds CSV files `audit.py` verifies.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--seeds', default='seeds.csv', help='Seeds CSV file path (default: seeds.csv).')
+        parser.add_argument('--winners', default='winners.csv', help='Winners CSV file path (default: winners.csv).')
+        parser.add_argument(
+            '--include-unrevealed', action='store_true',
+            help='Also export the Server Seeds still in use, which their users have not renewed yet '
+                 '(never publish such a file, those seeds predict the next draws).'
+        )
+
+    @staticmethod
+    def winner_rows(winner_model):
+        """Yields the winner rows of the ended giveaways of `winner_model`, the winners of a giveaway consecutively."""
+        rows = (
+            winner_model.objects
+            .filter(giveaway__success=True)
+            .order_by('giveaway_id', 'nonce', 'index')
+            .values_list(
+                'giveaway_id', 'giveaway__draw_version',
+                'giveaway__server_seed', 'giveaway__user_seed',
+                'giveaway__creator__server_seed', 'giveaway__creator__user_seed',
+                'nonce', 'giveaway__participant_count', 'giveaway__winner_count', 'index',
+            )
+            .iterator()
+        )
+        for (ga_id, draw_version, server_seed, user_seed, creator_server_seed, creator_user_seed,
+             nonce, participant_count, winner_count, index) in rows:
+            # giveaways drawn before their seeds were recorded can only be checked against the creator's current ones
+            if not server_seed:
+                server_seed, user_seed = creator_server_seed, creator_user_seed
+            yield ga_id, draw_version, server_seed, user_seed, nonce, participant_count, winner_count, index
+
+    @staticmethod
+    def unrevealed_seeds(server_seeds):
+        """Returns the ones of `server_seeds` that are some user's current Server Seed."""
+        server_seeds = list(server_seeds)
+        unrevealed = set()
+        for start in range(0, len(server_seeds), SEED_LOOKUP_BATCH_SIZE):
+            unrevealed.update(
+                DiscordUser.objects
+                .filter(server_seed__in=server_seeds[start:start + SEED_LOOKUP_BATCH_SIZE])
+                .values_list('server_seed', flat=True)
+            )
+        return unrevealed
+
+    def handle(self, *args, **options):
+        hashes = {}
+        winner_count = 0
+
+        with open(options['winners'], 'w', newline='') as winners_file:
+            writer = csv.writer(winners_file)
+            writer.writerow(WINNER_COLUMNS)
+
+            # archived giveaways keep their IDs, so they never mix with live ones
+            for winner_model in (ArchivedWinner, Winner):
+                for ga_id, draw_version, server_seed, user_seed, nonce, participant_count, ga_winner_count, index \
+                        in self.winner_rows(winner_model):
+                    if server_seed not in hashes:
+                        hashes[server_seed] = hashlib.sha512(server_seed.encode()).hexdigest()
+                    writer.writerow((
+                        ga_id, draw_version, hashes[server_seed], user_seed,
+                        nonce, participant_count, ga_winner_count, index,
+                    ))
+                    winner_count += 1
+
+        withheld = set() if options['include_unrevealed'] else self.unrevealed_seeds(hashes)
+        with open(options['seeds'], 'w', newline='') as seeds_file:
+            writer = csv.writer(seeds_file)
+            writer.writerow(SEED_COLUMNS)
+            writer.writerows(
+                (server_seed_hashed, server_seed)
+                for server_seed, server_seed_hashed in sorted(hashes.items(), key=lambda item: item[1])
+                if server_seed not in withheld
+            )
+
+        self.stdout.write(self.style.SUCCESS(
+            f'Exported {winner_count} winners to {options["winners"]} and {len(hashes) - len(withheld)} '
+            f'Server Seeds to {options["seeds"]} ({len(withheld)} still in use withheld, '
+            f'their giveaways are reported as not revealed).'
+        ))
@@ -0,0 +1,15 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('giveaways', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='giveaway',
+            index=models.Index(condition=models.Q(success__isnull=True), fields=['ending_at'], name='giveaway_ongoing_ending_idx'),
+        ),
+    ]
@@ -0,0 +1,36 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('giveaways', '0002_giveaway_ongoing_ending_idx'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='giveaway',
+            name='participant_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='giveaway',
+            name='winner_count_actual',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        # backfill from the through table and the winners of existing giveaways
+        migrations.RunSQL(
+            '''
+            UPDATE giveaways_giveaway AS giveaway SET
+                participant_count = (
+                    SELECT COUNT(*) FROM giveaways_giveaway_participants AS participant
+                    WHERE participant.giveaway_id = giveaway.id
+                ),
+                winner_count_actual = (
+                    SELECT COUNT(*) FROM giveaways_winner AS winner
+                    WHERE winner.giveaway_id = giveaway.id
+                )
+            ''',
+            migrations.RunSQL.noop,
+        ),
+    ]
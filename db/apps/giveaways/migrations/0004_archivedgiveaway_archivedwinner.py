@@ -0,0 +1,46 @@
+import django.contrib.postgres.fields
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0002_discorduser_discord_id_unique'),
+        ('guilds', '0002_discordguild_guild_id_unique'),
+        ('giveaways', '0003_giveaway_counters'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ArchivedGiveaway',
+            fields=[
+                ('id', models.IntegerField(primary_key=True, serialize=False)),
+                ('prize', models.CharField(max_length=400)),
+                ('winner_count', models.SmallIntegerField()),
+                ('participant_ids', django.contrib.postgres.fields.ArrayField(base_field=models.BigIntegerField(), blank=True, default=list, size=None)),
+                ('participant_count', models.PositiveIntegerField(default=0)),
+                ('winner_count_actual', models.PositiveIntegerField(default=0)),
+                ('created_at', models.DateTimeField()),
+                ('ending_at', models.DateTimeField()),
+                ('ended_at', models.DateTimeField(db_index=True)),
+                ('ended_time_str', models.CharField(max_length=200)),
+                ('success', models.BooleanField(null=True)),
+                ('archived_at', models.DateTimeField(auto_now_add=True)),
+                ('channel_id', models.BigIntegerField(blank=True, null=True)),
+                ('message_id', models.BigIntegerField(blank=True, null=True)),
+                ('creator', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='archived_giveaways', to='users.DiscordUser')),
+                ('guild', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='archived_giveaways', to='guilds.DiscordGuild')),
+            ],
+        ),
+        migrations.CreateModel(
+            name='ArchivedWinner',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('index', models.PositiveIntegerField()),
+                ('nonce', models.PositiveIntegerField()),
+                ('giveaway', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='winners', to='giveaways.ArchivedGiveaway')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='archived_winners', to='users.DiscordUser')),
+            ],
+        ),
+    ]
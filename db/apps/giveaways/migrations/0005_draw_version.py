@@ -0,0 +1,33 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('giveaways', '0004_archivedgiveaway_archivedwinner'),
+    ]
+
+    operations = [
+        # existing giveaways were drawn with version 1 and must keep verifying under it,
+        # new ones default to version 2
+        migrations.AddField(
+            model_name='giveaway',
+            name='draw_version',
+            field=models.PositiveSmallIntegerField(choices=[(1, 'v1'), (2, 'v2')], default=1),
+        ),
+        migrations.AlterField(
+            model_name='giveaway',
+            name='draw_version',
+            field=models.PositiveSmallIntegerField(choices=[(1, 'v1'), (2, 'v2')], default=2),
+        ),
+        migrations.AddField(
+            model_name='archivedgiveaway',
+            name='draw_version',
+            field=models.PositiveSmallIntegerField(choices=[(1, 'v1'), (2, 'v2')], default=1),
+        ),
+        migrations.AlterField(
+            model_name='archivedgiveaway',
+            name='draw_version',
+            field=models.PositiveSmallIntegerField(choices=[(1, 'v1'), (2, 'v2')], default=2),
+        ),
+    ]
@@ -0,0 +1,36 @@
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('giveaways', '0005_draw_version'),
+    ]
+
+    operations = [
+        # existing giveaways weren't tracked, they are scraped when they end
+        migrations.AddField(
+            model_name='giveaway',
+            name='entries_complete',
+            field=models.BooleanField(default=False),
+        ),
+        migrations.AlterField(
+            model_name='giveaway',
+            name='entries_complete',
+            field=models.BooleanField(default=True),
+        ),
+        migrations.CreateModel(
+            name='GiveawayEntry',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('discord_id', models.BigIntegerField()),
+                ('name', models.CharField(blank=True, max_length=200)),
+                ('discriminator', models.CharField(blank=True, max_length=4)),
+                ('giveaway', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='entries', to='giveaways.Giveaway')),
+            ],
+            options={
+                'unique_together': {('giveaway', 'discord_id')},
+            },
+        ),
+    ]
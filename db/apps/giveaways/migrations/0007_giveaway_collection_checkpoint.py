@@ -0,0 +1,26 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('giveaways', '0006_giveawayentry'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='giveaway',
+            name='collection_status',
+            field=models.CharField(choices=[('pending', 'Pending'), ('collecting', 'Collecting'), ('done', 'Done')], default='pending', max_length=10),
+        ),
+        migrations.AddField(
+            model_name='giveaway',
+            name='collection_cursor',
+            field=models.BigIntegerField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='giveaway',
+            name='collected_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+    ]
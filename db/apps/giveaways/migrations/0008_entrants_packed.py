@@ -0,0 +1,57 @@
+from itertools import groupby
+from operator import itemgetter
+
+from django.db import migrations, models
+
+from utils.entrants import EntrantSet
+
+
+def pack_entrants(apps, schema_editor):
+    Giveaway = apps.get_model('giveaways', 'Giveaway')
+    ArchivedGiveaway = apps.get_model('giveaways', 'ArchivedGiveaway')
+    Participant = Giveaway.participants.through
+
+    # one giveaway's participants at a time
+    participant_rows = (
+        Participant.objects
+        .order_by('giveaway_id')
+        .values_list('giveaway_id', 'discorduser__discord_id')
+        .iterator()
+    )
+    for ga_id, rows in groupby(participant_rows, key=itemgetter(0)):
+        entrants = EntrantSet(discord_id for _, discord_id in rows)
+        Giveaway.objects.filter(id=ga_id).update(entrants_packed=entrants.pack())
+
+    Giveaway.objects.filter(success=True, entrants_packed__isnull=True).update(entrants_packed=EntrantSet().pack())
+
+    for ga_id, participant_ids in ArchivedGiveaway.objects.values_list('id', 'participant_ids').iterator():
+        ArchivedGiveaway.objects.filter(id=ga_id).update(entrants_packed=EntrantSet(participant_ids).pack())
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('giveaways', '0007_giveaway_collection_checkpoint'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='giveaway',
+            name='entrants_packed',
+            field=models.BinaryField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='archivedgiveaway',
+            name='entrants_packed',
+            field=models.BinaryField(blank=True, null=True),
+        ),
+        migrations.RunPython(pack_entrants, migrations.RunPython.noop),
+        migrations.RemoveField(
+            model_name='giveaway',
+            name='participants',
+        ),
+        migrations.RemoveField(
+            model_name='archivedgiveaway',
+            name='participant_ids',
+        ),
+    ]
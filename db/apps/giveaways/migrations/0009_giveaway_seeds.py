@@ -0,0 +1,32 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('giveaways', '0008_entrants_packed'),
+    ]
+
+    operations = [
+        # giveaways drawn before are left empty, `exportaudit` falls back to their creator's current seeds
+        migrations.AddField(
+            model_name='giveaway',
+            name='user_seed',
+            field=models.CharField(blank=True, max_length=200),
+        ),
+        migrations.AddField(
+            model_name='giveaway',
+            name='server_seed',
+            field=models.CharField(blank=True, max_length=300),
+        ),
+        migrations.AddField(
+            model_name='archivedgiveaway',
+            name='user_seed',
+            field=models.CharField(blank=True, max_length=200),
+        ),
+        migrations.AddField(
+            model_name='archivedgiveaway',
+            name='server_seed',
+            field=models.CharField(blank=True, max_length=300),
+        ),
+    ]
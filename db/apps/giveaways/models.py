@@ -1,21 +1,175 @@
 import discord
+from array import array
+from collections import namedtuple
 
-from django.db import models
+from django.db import models, transaction
+from django.db.models import Prefetch, Q
 from django.conf import settings
 from django.utils import timezone
 
+from bot.outbound import PRIORITY_ANNOUNCEMENT, PRIORITY_REFRESH
 from db.apps.guilds.models import DiscordGuild
 from db.apps.users.models import DiscordUser
-from utils.objects import get_user_obj
+from utils.db import run_in_db_thread
+from utils.draw import DRAW_VERSIONS, LATEST_DRAW_VERSION, WinnerSelector
+from utils.entrants import EntrantSet
 
-from utils.time import process_elapsed_time_text
+from utils.time import process_remaining_time_text
 
 
-class Giveaway(models.Model):
+# maximum number of entrants listed in result files, to stay under Discord's upload size limit
+RESULT_ENTRANT_LIMIT = 100000
+# number of entries written at once by the entrant tracker
+PARTICIPANT_CHUNK_SIZE = 1000
+# minimum number of reaction users collected between two checkpoints while ending a giveaway,
+# checkpoints are also spaced by a quarter of the users collected so far so that rewriting them stays linear
+COLLECTION_CHECKPOINT_SIZE = 5000
+# users per page of reactions, the most Discord returns
+REACTION_PAGE_SIZE = 100
+
+
+class GiveawayQuerySet(models.QuerySet):
+
+    def with_render_data(self):
+        """Loads everything `embed` and `info_text` need, in a constant number of queries."""
+        return (
+            self
+            .select_related('creator', 'guild')
+            .prefetch_related(Prefetch('winners', queryset=Winner.objects.select_related('user')))
+        )
+
+
+class GiveawayResultMixin(object):
+    """What live and archived (`ArchivedGiveaway`) giveaways share to show their results."""
+    is_archived = False
+    bot = None
+
+    @property
+    def status(self):
+        return 'Ended' if self.ended_at else 'On going'
+
+    async def adelete(self):
+        await run_in_db_thread(self.delete)
+
+    def get_winners(self):
+        """Returns the list of winners with their users, in one query or from `with_render_data()`'s prefetch."""
+        if not self.winner_count_actual:
+            return []
+        if 'winners' in getattr(self, '_prefetched_objects_cache', {}):
+            return list(self.winners.all())
+        return list(self.winners.select_related('user'))
+
+    @staticmethod
+    def format_winners_discord(winners):
+        return '\n'.join([
+            f'• <@{winner.user.discord_id}> | '
+            f'Index: {winner.index} | '
+            f'Nonce: {winner.nonce}'
+            for winner in winners
+        ])
+
+    @property
+    def entrants(self):
+        """The `EntrantSet` saved when the giveaway ended, empty if there is none."""
+        if self.entrants_packed is None:
+            return EntrantSet()
+        return EntrantSet.unpack(self.entrants_packed)
+
+    @property
+    def winners_discord(self):
+        return self.format_winners_discord(self.get_winners())
+
+    @property
+    def info_text(self):
+        participant_count = self.participant_count
+        winners = self.get_winners()
+
+        txt = (
+            f'== Creator Information ==\n'
+            f'• Discord Tag  : {self.creator.__str__()}\n'
+            f'• Discord ID   : {self.creator.discord_id}\n\n'
+            f'== Giveaway Information ==\n'
+            f'• ID           : {self.id}\n'
+            f'• Prize        : {self.prize}\n'
+            f'• Winner Count : {self.winner_count}\n'
+            f'• Participants : {participant_count}\n'
+            f'• Sure Win     : {self.winner_count >= participant_count}\n'
+            f'• Draw Version : {self.draw_version}\n'
+            f'• Created at   : {self.created_at:%H:%M:%S %A %B %d, %Y (%Z)}\n'
+            f'• Ending at    : {self.ending_at:%H:%M:%S %A %B %d, %Y (%Z)}\n'
+            f'• Ended at     : {"On going" if not self.ended_at else self.ended_at.strftime("%H:%M:%S %A %B %d, %Y (%Z)")}\n'
+            f'• Success      : {self.success}\n'
+            f'• Server       : {self.guild.name} [{self.guild.guild_id}]\n\n'
+            f'== Winners Information ==\n'
+            f'{"User Tag":^20}|{"User ID":^20}|{"Index":^8}|{"Nonce":^8}|\n'
+        )
+        if winners:
+            txt += '\n'.join([
+                f'{winner.user.__str__():<20}|'
+                f'{winner.user.discord_id:^20}|'
+                f'{winner.index:>7} |'
+                f'{winner.nonce:>7} |'
+                for winner in winners
+            ])
+        else:
+            txt += f'{"None":=^60}'
+
+        # sorted entrants, so that every Index can be checked against them
+        entrants = self.entrants
+        if entrants:
+            txt += (
+                f'\n\n== Participants (sorted by Discord ID) ==\n'
+                f'{"Index":^8}|{"User ID":^20}|\n'
+            )
+            txt += '\n'.join([
+                f'{index:>7} |{discord_id:^20}|'
+                for index, discord_id in zip(range(RESULT_ENTRANT_LIMIT), entrants)
+            ])
+            if len(entrants) > RESULT_ENTRANT_LIMIT:
+                txt += f'\n... and {len(entrants) - RESULT_ENTRANT_LIMIT} more'
+
+        return txt
+
+    async def ainfo_text(self):
+        return await run_in_db_thread(lambda: self.info_text)
+
+    async def delete_message(self):
+        """Deletes the giveaway message by its channel and message IDs, without fetching it."""
+        if not isinstance(self.bot, discord.Client):
+            raise AttributeError('`bot` must be `discord.Client`.')
+
+        try:
+            await self.bot.http.delete_message(self.channel_id, self.message_id)
+        except discord.HTTPException:
+            pass
+
+
+class Giveaway(GiveawayResultMixin, models.Model):
+    COLLECTION_PENDING = 'pending'
+    COLLECTION_RUNNING = 'collecting'
+    COLLECTION_DONE = 'done'
+    COLLECTION_STATUSES = [
+        (COLLECTION_PENDING, 'Pending'),
+        (COLLECTION_RUNNING, 'Collecting'),
+        (COLLECTION_DONE, 'Done'),
+    ]
+
     creator = models.ForeignKey(DiscordUser, related_name='giveaways', on_delete=models.CASCADE)
     prize = models.CharField(max_length=400)
     winner_count = models.SmallIntegerField()
-    participants = models.ManyToManyField(DiscordUser, related_name='+', blank=True)
+    # sorted Discord IDs of the entrants, saved as a packed `EntrantSet` when the giveaway ends
+    entrants_packed = models.BinaryField(blank=True, null=True)
+    # kept up to date with `entrants_packed` and `winners` when the giveaway ends, so reads never count them
+    participant_count = models.PositiveIntegerField(default=0)
+    winner_count_actual = models.PositiveIntegerField(default=0)
+    # algorithm the winners are drawn with, giveaways keep verifying under the version they were created with
+    draw_version = models.PositiveSmallIntegerField(
+        default=LATEST_DRAW_VERSION,
+        choices=[(version, f'v{version}') for version in DRAW_VERSIONS]
+    )
+    # the creator's seeds when the winners were drawn, so results stay auditable after they renew them (`newseed`)
+    user_seed = models.CharField(max_length=200, blank=True)
+    server_seed = models.CharField(max_length=300, blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
     ending_at = models.DateTimeField()
     ended_at = models.DateTimeField(blank=True, null=True)
@@ -32,7 +186,23 @@ class Giveaway(models.Model):
     guild = models.ForeignKey(DiscordGuild, related_name='giveaways', on_delete=models.CASCADE)
     channel_id = models.BigIntegerField(blank=True, null=True)
     message_id = models.BigIntegerField(blank=True, null=True)
-    bot = None
+    # dict of the embed last sent to Discord, to skip edits that change nothing
+    rendered_embed = None
+    # whether `entries` were tracked from every reaction event since creation, see bot/entrants.py
+    entries_complete = models.BooleanField(default=True)
+    # checkpoint of the reaction users collected when ending: the last collected user ID, an interrupted
+    # collection resumes after it
+    collection_status = models.CharField(max_length=10, choices=COLLECTION_STATUSES, default=COLLECTION_PENDING)
+    collection_cursor = models.BigIntegerField(blank=True, null=True)
+    collected_count = models.PositiveIntegerField(default=0)
+
+    objects = GiveawayQuerySet.as_manager()
+
+    class Meta:
+        indexes = [
+            # on going giveaways, loaded by the giveaway task ordered by their deadline
+            models.Index(fields=['ending_at'], name='giveaway_ongoing_ending_idx', condition=Q(success__isnull=True)),
+        ]
 
     def __str__(self):
         return f'{self.prize} [{self.status}]'
@@ -43,14 +213,19 @@ class Giveaway(models.Model):
         self.ended_at = timezone.now()
         self.save()
 
+    async def amark_success(self, success: bool):
+        await run_in_db_thread(self.mark_success, success)
+
+    async def arefresh_from_db(self):
+        await run_in_db_thread(self.refresh_from_db)
+
+    async def asave(self):
+        await run_in_db_thread(self.save)
+
     @property
     def passed_ending_time(self):
         return timezone.now() > self.ending_at
 
-    @property
-    def status(self):
-        return 'Ended' if self.ended_at else 'On going'
-
     @property
     def discord_channel(self):
         if not isinstance(self.bot, discord.Client):
@@ -75,48 +250,6 @@ class Giveaway(models.Model):
         else:
             return None
 
-    @property
-    def winners_discord(self):
-        return '\n'.join([
-            f'• <@{winner.user.discord_id}> | '
-            f'Index: {winner.index} | '
-            f'Nonce: {winner.nonce}'
-            for winner in self.winners.all()
-        ])
-
-    @property
-    def info_text(self):
-        txt = (
-            f'== Creator Information ==\n'
-            f'• Discord Tag  : {self.creator.__str__()}\n'
-            f'• Discord ID   : {self.creator.discord_id}\n\n'
-            f'== Giveaway Information ==\n'
-            f'• ID           : {self.id}\n'
-            f'• Prize        : {self.prize}\n'
-            f'• Winner Count : {self.winner_count}\n'
-            f'• Participants : {self.participants.count()}\n'
-            f'• Sure Win     : {self.winner_count >= self.participants.count()}\n'
-            f'• Created at   : {self.created_at:%H:%M:%S %A %B %d, %Y (%Z)}\n'
-            f'• Ending at    : {self.ending_at:%H:%M:%S %A %B %d, %Y (%Z)}\n'
-            f'• Ended at     : {"On going" if not self.ended_at else self.ended_at.strftime("%H:%M:%S %A %B %d, %Y (%Z)")}\n'
-            f'• Success      : {self.success}\n'
-            f'• Server       : {self.guild.name} [{self.guild.guild_id}]\n\n'
-            f'== Winners Information ==\n'
-            f'{"User Tag":^20}|{"User ID":^20}|{"Index":^8}|{"Nonce":^8}|\n'
-        )
-        if self.winners.exists():
-            txt += '\n'.join([
-                f'{winner.user.__str__():<20}|'
-                f'{winner.user.discord_id:^20}|'
-                f'{winner.index:>7} |'
-                f'{winner.nonce:>7} |'
-                for winner in self.winners.all()
-            ])
-        else:
-            txt += f'{"None":=^60}'
-
-        return txt
-
     @property
     def embed(self):
         if self.ended_at:
@@ -132,21 +265,28 @@ class Giveaway(models.Model):
             time_remaining = self.time_remaining
             timestamp = self.ending_at
 
-        embed = discord.Embed(
-            title=title,
-            description=
+        description = (
             f'• Prize: **{self.prize}**\n'
             f'• Winners: **{self.winner_count}**\n'
-            f'• Time remaining: **{time_remaining}**\n\n',
+        )
+        if self.ended_at:
+            description += f'• Participants: **{self.participant_count}**\n'
+        description += f'• Time remaining: **{time_remaining}**\n\n'
+
+        embed = discord.Embed(
+            title=title,
+            description=description,
             timestamp=timestamp,
             color=color,
         )
 
-        if self.winners.exists():
+        # giveaways without winners (on going ones included) render without any query
+        winners = self.get_winners()
+        if winners:
 
             embed.add_field(
                 name='Winners',
-                value=self.winners_discord
+                value=self.format_winners_discord(winners)
             )
 
         elif not self.ended_at:
@@ -161,6 +301,9 @@ class Giveaway(models.Model):
 
         return embed
 
+    async def aembed(self):
+        return await run_in_db_thread(lambda: self.embed)
+
     async def end(self, for_task=False, for_reroll=False, context=None):
         """
         End the Giveaway.
@@ -169,21 +312,30 @@ class Giveaway(models.Model):
         Otherwise -> use in `end` giveaway command
         """
 
-        # fetch the message from Discord
+        if for_task:
+            # the task's object may be stale: ended or deleted (`DoesNotExist` is raised then) by a command since
+            await self.arefresh_from_db()
+            if self.success is not None:
+                return
+
+            # on going giveaways only need their time remaining updated,
+            # which is done by message ID without fetching the message
+            if not self.passed_ending_time:
+                await self.edit_if_changed()
+                return
+
+        # fetch the message from Discord, its reactions are needed from here
         ga_message = await self.discord_message()
 
         # message not found, or forbidden to see -> giveaway failed
         # TODO: Set a threshold for a number of retries
         if not ga_message:
-            self.mark_success(False)
+            await self.amark_success(False)
             print(f'Giveaway ID [{self.id}] failed because the Discord message was not found.')
             return
 
-        # criteria depends on whether the giveaway has passed its ending_at dt or not
-        if for_task:
-            criteria = self.passed_ending_time
         # forbide rerolling on going giveaways (`success` is None)
-        elif for_reroll:
+        if for_reroll:
             if self.success is None:
                 await context.say_as_embed(
                     f'Your Giveaway (ID: `{self.id}`) still on going. '
@@ -191,25 +343,15 @@ class Giveaway(models.Model):
                 )
                 return
             # deletes all previous winners
-            self.winners.all().delete()
-            criteria = True
+            await run_in_db_thread(self.clear_winners)
         # forbide ending ended giveaways (`success` is True)
-        else:
+        elif not for_task:
             if self.success is True:
                 await context.say_as_embed(
                     f'Your Giveaway (ID: `{self.id}`) already ended. '
                     f'Use `{context.prefix}reroll {self.id}` if you want to reroll it.'
                 )
                 return
-            criteria = True
-
-        # ending criteria not met, just update the message
-        if not criteria:
-            # only edit ongoing giveaway messages
-            self.refresh_from_db()
-            if not self.ended_at:
-                await ga_message.edit(embed=self.embed)
-            return
 
         # ending criteria met, time for some info gathering
         reaction = None
@@ -221,84 +363,281 @@ class Giveaway(models.Model):
 
         # reaction emoji not found, someone booli and removed the bot's reaction
         if not reaction:
-            self.mark_success(False)
+            await self.amark_success(False)
             message = f'Giveaway [ID `{self.id}`] ended because it has no reactions.'
             await self.send_completion_message(ga_message.channel, message=message)
-            return await ga_message.edit(embed=self.embed)
+            return await self.bot.outbound.edit(ga_message, embed=await self.aembed())
+
+        # rerolls draw again among the entrants saved when the giveaway ended,
+        # endings use the entrants tracked from reaction events while the giveaway was on going
+        if for_reroll:
+            entrants = await run_in_db_thread(self.get_entrants)
+        else:
+            entrants = await self.tracked_entries(reaction)
 
         # forming qualified entries from the list of reacted users
-        qualified_entries = []
-        async for user in reaction.users():
-            if not user.bot:
-                qualified_entries.append(user)
+        if entrants is None:
+            entrants = await self.collect_entries(reaction)
+
+        # forming winners and saving them with the final entrant set, off the event loop
+        await run_in_db_thread(self.save_results, entrants)
+        await self.name_winners()
 
         # no qualified entries, too bad it's ending with 0 winners
-        if not qualified_entries:
-            self.mark_success(True)
+        if not entrants:
+            await self.amark_success(True)
             message = f'Giveaway [ID `{self.id}`] ended with no winners.'
             await self.send_completion_message(ga_message.channel, message=message)
-            return await ga_message.edit(embed=self.embed)
-
-        # forming winners!
-        winners = []
-        # sure win, no Provable Fairness Information used
-        if len(qualified_entries) <= self.winner_count:
-            for entry in qualified_entries:
-                _entry = WinnerEntry(entry, 0, 0)
-                winners.append(_entry)
-        # chance win, the creator's PFI is used
-        else:
+            return await self.bot.outbound.edit(ga_message, embed=await self.aembed())
 
-            # loop until enough distinct winners
-            while len(winners) < self.winner_count:
+        # cool now as it's ending with some winners!
+        await self.amark_success(True)
+        await self.send_completion_message(ga_message.channel)
+        return await self.bot.outbound.edit(ga_message, embed=await self.aembed())
 
-                index, nonce = self.creator.pfair_randomize(len(qualified_entries))
-                sorted_entries = sorted(qualified_entries, key=lambda x: x.id)
+    def get_entrants(self):
+        """Returns the saved `EntrantSet` (from the database, it isn't kept on the object), or None if there is none."""
+        entrants_packed = Giveaway.objects.filter(id=self.id).values_list('entrants_packed', flat=True).get()
+        if entrants_packed is None:
+            return None
+        return EntrantSet.unpack(entrants_packed)
 
-                winner = sorted_entries[index]
-                _entry = WinnerEntry(winner, index, nonce)
+    def get_tracked_entrants(self):
+        """Returns the Discord IDs of the tracked entrants, or None if reaction events were missed."""
+        if not Giveaway.objects.filter(id=self.id, entries_complete=True).exists():
+            return None
+        return EntrantSet(self.entries.values_list('discord_id', flat=True))
 
-                if _entry in winners:
+    async def tracked_entries(self, reaction):
+        """
+        Returns the `EntrantSet` of the entrants tracked from reaction events.
+        Returns None if they can't be trusted and `reaction` must be scraped instead: events were missed
+        or the tracked entrants don't add up to the reaction count (other bots reacted, for instance).
+        """
+        # changes still buffered by the tracker
+        await self.bot.entrant_tracker.flush(self.id)
+
+        entrants = await run_in_db_thread(self.get_tracked_entrants)
+        # the bot's own reaction isn't an entry
+        if entrants is None or len(entrants) != reaction.count - int(reaction.me):
+            return None
+
+        await run_in_db_thread(self.save_collection_checkpoint, entrants, done=True)
+        return entrants
+
+    def get_collection_checkpoint(self):
+        """Returns the collection status and cursor, with the `EntrantSet` collected so far."""
+        status, cursor, entrants_packed = (
+            Giveaway.objects
+            .filter(id=self.id)
+            .values_list('collection_status', 'collection_cursor', 'entrants_packed')
+            .get()
+        )
+        if status == Giveaway.COLLECTION_PENDING or entrants_packed is None:
+            return Giveaway.COLLECTION_PENDING, None, EntrantSet()
+        return status, cursor, EntrantSet.unpack(entrants_packed)
+
+    async def collect_entries(self, reaction):
+        """
+        Pages through the users of `reaction` and returns the `EntrantSet` of those who aren't bots.
+        It is saved every `COLLECTION_CHECKPOINT_SIZE` users (more once many are collected) with a checkpoint of the largest
+        user ID of the last page read whole, so a collection interrupted by a crash or an HTTP error resumes from the next page.
+        """
+        status, cursor, entrants = await run_in_db_thread(self.get_collection_checkpoint)
+        if status == Giveaway.COLLECTION_DONE:
+            return entrants
+
+        emoji = f'{reaction.emoji.name}:{reaction.emoji.id}' if reaction.custom_emoji else reaction.emoji
+        message = reaction.message
+
+        # pages are read from the HTTP API rather than `reaction.users()`, which yields each page
+        # in descending ID order: the checkpoint must only move once a page has been read whole
+        # only Discord IDs are kept around
+        chunk = array('q')
+        while True:
+            page = await self.bot.http.get_reaction_users(
+                message.channel.id, message.id, emoji, REACTION_PAGE_SIZE, after=cursor
+            )
+            chunk.extend(int(user['id']) for user in page if not user.get('bot'))
+            if page:
+                cursor = max(int(user['id']) for user in page)
+
+            if len(page) < REACTION_PAGE_SIZE:
+                break
+
+            if len(chunk) >= max(COLLECTION_CHECKPOINT_SIZE, len(entrants) // 4):
+                entrants = await run_in_db_thread(self.save_collection_checkpoint, entrants, chunk, cursor)
+                chunk = array('q')
+
+        return await run_in_db_thread(self.save_collection_checkpoint, entrants, chunk, cursor, done=True)
+
+    def save_collection_checkpoint(self, entrants, chunk=(), cursor=None, done=False):
+        """
+        Saves the `EntrantSet` collected so far, packed, with the last user ID seen, and returns it.
+        The IDs in `chunk` are added to `entrants` first, here rather than on the event loop.
+        """
+        if chunk:
+            entrants = entrants.union(chunk)
+
+        self.collection_status = Giveaway.COLLECTION_DONE if done else Giveaway.COLLECTION_RUNNING
+        self.collection_cursor = cursor
+        self.collected_count = len(entrants)
+        Giveaway.objects.filter(id=self.id).update(
+            entrants_packed=entrants.pack(),
+            collection_status=self.collection_status,
+            collection_cursor=cursor,
+            collected_count=self.collected_count,
+        )
+        return entrants
+
+    async def name_winners(self):
+        """Fills in the names of winners, only their Discord IDs are known when they are drawn."""
+        unnamed_ids = await run_in_db_thread(
+            lambda: list(self.winners.filter(user__name='').values_list('user__discord_id', flat=True))
+        )
+
+        discord_users = []
+        for discord_id in unnamed_ids:
+            discord_user = self.bot.get_user(discord_id)
+            if discord_user is None:
+                try:
+                    discord_user = await self.bot.fetch_user(discord_id)
+                except discord.HTTPException:
                     continue
+            discord_users.append(discord_user)
 
-                winners.append(_entry)
+        if discord_users:
+            await run_in_db_thread(DiscordUser.objects.bulk_upsert, discord_users)
 
-        # update winner list to the database
-        winner_objs = [
-            Winner(
-                giveaway=self,
-                user=get_user_obj(winner.discord)[0],
-                index=winner.index,
-                nonce=winner.nonce)
-            for winner in winners
-        ]
-        Winner.objects.bulk_create(winner_objs)
+    def clear_winners(self):
+        """Deletes the winners, and the collection checkpoint so that rerolls without saved entrants start over."""
+        with transaction.atomic():
+            self.winners.all().delete()
+            self.winner_count_actual = 0
+            self.collection_status = Giveaway.COLLECTION_PENDING
+            self.collection_cursor = None
+            self.collected_count = 0
+            Giveaway.objects.filter(id=self.id).update(
+                winner_count_actual=0,
+                collection_status=self.collection_status,
+                collection_cursor=None,
+                collected_count=0,
+            )
 
-        # update participant list to the database
-        self.participants.add(*[get_user_obj(entry)[0] for entry in qualified_entries])
+    def save_results(self, entrants):
+        """
+        Picks winners among `entrants` (an `EntrantSet`), then saves them along with the packed entrant set
+        and the participant and winner counters.
+        """
 
-        # cool now as it's ending with some winners!
-        self.mark_success(True)
-        await self.send_completion_message(ga_message.channel)
-        return await ga_message.edit(embed=self.embed)
+        with transaction.atomic():
+            # forming winners! Sure wins use no Provable Fairness Information, chance wins use
+            # the creator's: its nonces stay reserved (row locked) until the winners are saved,
+            # and are given back if saving fails
+            selector = WinnerSelector(entrants)
+            winners = [
+                WinnerEntry(discord_id, index, nonce)
+                for discord_id, index, nonce in selector.select(self.winner_count, self.creator, self.draw_version)
+            ]
+
+            # only winners get a user, named after their tracked entry if any (`name_winners()` fills in the others)
+            winner_ids = [winner.discord_id for winner in winners]
+            names = {
+                discord_id: (name, discriminator)
+                for discord_id, name, discriminator
+                in self.entries.filter(discord_id__in=winner_ids).values_list('discord_id', 'name', 'discriminator')
+            }
+            user_pks = DiscordUser.objects.bulk_upsert([
+                Entrant(discord_id, *names.get(discord_id, ('', ''))) for discord_id in winner_ids
+            ])
+
+            # update winner list to the database
+            winner_objs = [
+                Winner(
+                    giveaway=self,
+                    user_id=user_pks[winner.discord_id],
+                    index=winner.index,
+                    nonce=winner.nonce)
+                for winner in winners
+            ]
+            Winner.objects.bulk_create(winner_objs)
+
+            self.participant_count = len(entrants)
+            self.winner_count_actual = len(winner_objs)
+            # the creator's seeds as of the draw (reserving nonces reloads them), sure wins record them too
+            self.user_seed = self.creator.user_seed
+            self.server_seed = self.creator.server_seed
+            Giveaway.objects.filter(id=self.id).update(
+                entrants_packed=entrants.pack(),
+                participant_count=self.participant_count,
+                winner_count_actual=self.winner_count_actual,
+                user_seed=self.user_seed,
+                server_seed=self.server_seed,
+            )
+
+            # entrants are final, the live ones aren't needed anymore
+            self.entries.all().delete()
+
+    async def edit_message(self, embed):
+        """
+        Edits the giveaway message by its channel and message IDs, without fetching it.
+        It's a low priority refresh, replaced by any later edit of the message queued before it's sent.
+        Returns False if Discord says it does not exist (404) or the bot can't access it anymore (403).
+        """
+        if not isinstance(self.bot, discord.Client):
+            raise AttributeError('`bot` must be `discord.Client`.')
+
+        try:
+            await self.bot.outbound.edit_message(self.bot.http, self.channel_id, self.message_id, embed=embed.to_dict())
+        except (discord.NotFound, discord.Forbidden):
+            return False
+
+        return True
+
+    async def edit_if_changed(self):
+        """Edits the giveaway message only if its embed differs from the last one sent."""
+        embed = await self.aembed()
+        embed_dict = embed.to_dict()
+        if embed_dict == self.rendered_embed:
+            return
+
+        if not await self.edit_message(embed):
+            # 404 or 403, make sure the message is really gone or out of reach before failing the giveaway
+            # (retrying would only fail the same way on every tick)
+            ga_message = await self.discord_message()
+            try:
+                if ga_message:
+                    await self.bot.outbound.edit(ga_message, priority=PRIORITY_REFRESH, embed=embed)
+            except (discord.NotFound, discord.Forbidden):
+                ga_message = None
+
+            if not ga_message:
+                await self.amark_success(False)
+                print(f'Giveaway ID [{self.id}] failed because the Discord message was not found or not editable.')
+                return
+
+        self.rendered_embed = embed_dict
 
     async def send_completion_message(self, ga_channel, message=None):
 
-        if self.winners.exists():
-            mentions = ', '.join(f'<@{discord_id}>' for discord_id in self.winners.values_list('user__discord_id', flat=True))
-            await ga_channel.send(
-                f'Congratulations!! {mentions} won **{self.prize}**!'
+        winner_ids = await run_in_db_thread(lambda: list(self.winners.values_list('user__discord_id', flat=True)))
+        if winner_ids:
+            mentions = ', '.join(f'<@{discord_id}>' for discord_id in winner_ids)
+            await self.bot.outbound.send(
+                ga_channel,
+                priority=PRIORITY_ANNOUNCEMENT,
+                content=f'Congratulations!! {mentions} won **{self.prize}**!'
             )
         else:
             message = f'Giveaway ID `{self.id}` ended but everyone is chillin\' so no winner is selected~!' if not message else message
-            await ga_channel.send(message)
+            await self.bot.outbound.send(ga_channel, priority=PRIORITY_ANNOUNCEMENT, content=message)
 
     @property
     def time_remaining(self):
         if self.ended_at or self.passed_ending_time:
             return 'Ended'
         else:
-            return process_elapsed_time_text(self.ending_at - timezone.now())
+            return process_remaining_time_text(self.ending_at - timezone.now())
 
 
 class Winner(models.Model):
@@ -308,20 +647,175 @@ class Winner(models.Model):
     nonce = models.PositiveIntegerField()
 
 
+# a Discord user as known from a reaction event, name and discriminator are empty if it wasn't cached
+Entrant = namedtuple('Entrant', ['id', 'name', 'discriminator'])
+
+
+class GiveawayEntryManager(models.Manager):
+
+    def apply_changes(self, changes, unverified_ids=()):
+        """
+        Writes the entrant changes buffered by the tracker in one transaction.
+        `changes` is a dict of giveaway ID -> {Discord ID: `Entrant` (reacted), or None (unreacted)}.
+        The giveaways with `unverified_ids` get `entries_complete=False`, their entrants are scraped when they end.
+        Giveaways that ended or were deleted in the meantime are skipped.
+        """
+        with transaction.atomic():
+            ongoing_ids = set(Giveaway.objects.filter(id__in=list(changes), success=None).values_list('id', flat=True))
+
+            unverified_ids = ongoing_ids & set(unverified_ids)
+            if unverified_ids:
+                Giveaway.objects.filter(id__in=list(unverified_ids)).update(entries_complete=False)
+
+            entries = []
+            for ga_id in ongoing_ids:
+                removed_ids = [discord_id for discord_id, entrant in changes[ga_id].items() if entrant is None]
+                if removed_ids:
+                    self.filter(giveaway_id=ga_id, discord_id__in=removed_ids).delete()
+
+                entries.extend(
+                    GiveawayEntry(
+                        giveaway_id=ga_id,
+                        discord_id=entrant.id,
+                        name=entrant.name,
+                        discriminator=entrant.discriminator)
+                    for entrant in changes[ga_id].values()
+                    if entrant is not None
+                )
+
+            self.bulk_create(entries, batch_size=PARTICIPANT_CHUNK_SIZE, ignore_conflicts=True)
+
+
+class GiveawayEntry(models.Model):
+    """A Discord user reacting to an on going giveaway, tracked from reaction events."""
+    giveaway = models.ForeignKey(Giveaway, related_name='entries', on_delete=models.CASCADE)
+    discord_id = models.BigIntegerField()
+    name = models.CharField(max_length=200, blank=True)
+    discriminator = models.CharField(max_length=4, blank=True)
+
+    objects = GiveawayEntryManager()
+
+    class Meta:
+        unique_together = [('giveaway', 'discord_id')]
+
+
+class ArchivedGiveawayManager(models.Manager):
+
+    def archive(self, ended_before, batch_size=100):
+        """
+        Moves giveaways that ended before `ended_before`, with their winners and entrants,
+        out of the hot tables into the archive ones, `batch_size` giveaways per transaction.
+        Returns the number of archived giveaways.
+        """
+        archived_count = 0
+
+        while True:
+            with transaction.atomic():
+                ga_objs = list(
+                    Giveaway.objects
+                    .filter(success__isnull=False, ended_at__lt=ended_before)
+                    .order_by('ended_at')
+                    .select_for_update(skip_locked=True)[:batch_size]
+                )
+                if not ga_objs:
+                    return archived_count
+
+                ga_ids = [ga_obj.id for ga_obj in ga_objs]
+
+                self.bulk_create([
+                    ArchivedGiveaway(
+                        id=ga_obj.id,
+                        creator_id=ga_obj.creator_id,
+                        prize=ga_obj.prize,
+                        winner_count=ga_obj.winner_count,
+                        entrants_packed=ga_obj.entrants_packed,
+                        participant_count=ga_obj.participant_count,
+                        winner_count_actual=ga_obj.winner_count_actual,
+                        draw_version=ga_obj.draw_version,
+                        user_seed=ga_obj.user_seed,
+                        server_seed=ga_obj.server_seed,
+                        created_at=ga_obj.created_at,
+                        ending_at=ga_obj.ending_at,
+                        ended_at=ga_obj.ended_at,
+                        ended_time_str=ga_obj.ended_time_str,
+                        success=ga_obj.success,
+                        guild_id=ga_obj.guild_id,
+                        channel_id=ga_obj.channel_id,
+                        message_id=ga_obj.message_id,
+                    )
+                    for ga_obj in ga_objs
+                ])
+                ArchivedWinner.objects.bulk_create([
+                    ArchivedWinner(giveaway_id=winner.giveaway_id, user_id=winner.user_id, index=winner.index, nonce=winner.nonce)
+                    for winner in Winner.objects.filter(giveaway_id__in=ga_ids).order_by('id')
+                ])
+
+                # cascades to their winners
+                Giveaway.objects.filter(id__in=ga_ids).delete()
+
+            archived_count += len(ga_objs)
+
+
+class ArchivedGiveaway(GiveawayResultMixin, models.Model):
+    """An ended Giveaway moved out of the hot tables, it keeps the ID it had."""
+    id = models.IntegerField(primary_key=True)
+    creator = models.ForeignKey(DiscordUser, related_name='archived_giveaways', on_delete=models.CASCADE)
+    prize = models.CharField(max_length=400)
+    winner_count = models.SmallIntegerField()
+    entrants_packed = models.BinaryField(blank=True, null=True)
+    participant_count = models.PositiveIntegerField(default=0)
+    winner_count_actual = models.PositiveIntegerField(default=0)
+    draw_version = models.PositiveSmallIntegerField(
+        default=LATEST_DRAW_VERSION,
+        choices=[(version, f'v{version}') for version in DRAW_VERSIONS]
+    )
+    user_seed = models.CharField(max_length=200, blank=True)
+    server_seed = models.CharField(max_length=300, blank=True)
+    created_at = models.DateTimeField()
+    ending_at = models.DateTimeField()
+    ended_at = models.DateTimeField(db_index=True)
+    ended_time_str = models.CharField(max_length=200)
+    success = models.BooleanField(null=True)
+    archived_at = models.DateTimeField(auto_now_add=True)
+
+    # Discord stuff
+    guild = models.ForeignKey(DiscordGuild, related_name='archived_giveaways', on_delete=models.CASCADE)
+    channel_id = models.BigIntegerField(blank=True, null=True)
+    message_id = models.BigIntegerField(blank=True, null=True)
+
+    is_archived = True
+
+    objects = ArchivedGiveawayManager()
+
+    def __str__(self):
+        return f'{self.prize} [Archived]'
+
+    @property
+    def time_remaining(self):
+        return 'Ended'
+
+
+class ArchivedWinner(models.Model):
+    user = models.ForeignKey(DiscordUser, related_name='archived_winners', on_delete=models.CASCADE)
+    giveaway = models.ForeignKey(ArchivedGiveaway, related_name='winners', on_delete=models.CASCADE)
+    index = models.PositiveIntegerField()
+    nonce = models.PositiveIntegerField()
+
+
 class WinnerEntry(object):
-    def __init__(self, discord_user, index, nonce):
-        self.discord = discord_user
+    def __init__(self, discord_id, index, nonce):
+        self.discord_id = discord_id
         self.index = index
         self.nonce = nonce
 
     def __str__(self):
-        return f'{self.discord} <{self.index} {self.nonce}>'
+        return f'{self.discord_id} <{self.index} {self.nonce}>'
 
     def __repr__(self):
-        return f'{self.discord} <{self.index} {self.nonce}>'
+        return f'{self.discord_id} <{self.index} {self.nonce}>'
 
     def __eq__(self, other):
-        return self.discord == other.discord
+        return self.discord_id == other.discord_id
 
     def __ne__(self, other):
-        return self.discord != other.discord
+        return self.discord_id != other.discord_id
@@ -0,0 +1,43 @@
+from django.db import migrations, models
+from django.db.models import Count, Min
+
+
+def merge_duplicate_guilds(apps, schema_editor):
+    """Keeps the oldest row of every duplicated `guild_id` and points giveaways to it."""
+    DiscordGuild = apps.get_model('guilds', 'DiscordGuild')
+    Giveaway = apps.get_model('giveaways', 'Giveaway')
+
+    duplicates = (
+        DiscordGuild.objects
+        .values('guild_id')
+        .annotate(row_count=Count('id'), kept_id=Min('id'))
+        .filter(row_count__gt=1)
+    )
+    for duplicate in duplicates:
+        kept_id = duplicate['kept_id']
+        stale_ids = list(
+            DiscordGuild.objects
+            .filter(guild_id=duplicate['guild_id'])
+            .exclude(id=kept_id)
+            .values_list('id', flat=True)
+        )
+
+        Giveaway.objects.filter(guild_id__in=stale_ids).update(guild_id=kept_id)
+        DiscordGuild.objects.filter(id__in=stale_ids).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('guilds', '0001_initial'),
+        ('giveaways', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.RunPython(merge_duplicate_guilds, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='discordguild',
+            name='guild_id',
+            field=models.BigIntegerField(unique=True),
+        ),
+    ]
@@ -2,7 +2,7 @@ from django.db import models
 
 
 class DiscordGuild(models.Model):
-    guild_id = models.BigIntegerField()
+    guild_id = models.BigIntegerField(unique=True)
     name = models.CharField(max_length=100, blank=True)
 
     def __str__(self):
@@ -0,0 +1,52 @@
+from django.db import migrations, models
+from django.db.models import Count, Min
+
+
+def merge_duplicate_users(apps, schema_editor):
+    """Keeps the oldest row of every duplicated `discord_id` and points references to it."""
+    DiscordUser = apps.get_model('users', 'DiscordUser')
+    Giveaway = apps.get_model('giveaways', 'Giveaway')
+    Winner = apps.get_model('giveaways', 'Winner')
+    Participant = Giveaway.participants.through
+
+    duplicates = (
+        DiscordUser.objects
+        .values('discord_id')
+        .annotate(row_count=Count('id'), kept_id=Min('id'))
+        .filter(row_count__gt=1)
+    )
+    for duplicate in duplicates:
+        kept_id = duplicate['kept_id']
+        stale_ids = list(
+            DiscordUser.objects
+            .filter(discord_id=duplicate['discord_id'])
+            .exclude(id=kept_id)
+            .values_list('id', flat=True)
+        )
+
+        Giveaway.objects.filter(creator_id__in=stale_ids).update(creator_id=kept_id)
+        Winner.objects.filter(user_id__in=stale_ids).update(user_id=kept_id)
+
+        # participations the kept user already has would break the through table's uniqueness
+        kept_giveaway_ids = Participant.objects.filter(discorduser_id=kept_id).values_list('giveaway_id', flat=True)
+        Participant.objects.filter(discorduser_id__in=stale_ids, giveaway_id__in=list(kept_giveaway_ids)).delete()
+        Participant.objects.filter(discorduser_id__in=stale_ids).update(discorduser_id=kept_id)
+
+        DiscordUser.objects.filter(id__in=stale_ids).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0001_initial'),
+        ('giveaways', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.RunPython(merge_duplicate_users, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='discorduser',
+            name='discord_id',
+            field=models.BigIntegerField(unique=True),
+        ),
+    ]
@@ -1,14 +1,65 @@
 import hashlib
-import hmac
 
-from django.db import models
+from django.db import connection, models
 from django.utils import timezone
 
 from utils.core import generate_server_seed
 
 
+class DiscordUserManager(models.Manager):
+
+    def bulk_upsert(self, discord_users, batch_size=1000):
+        """
+        Creates or updates (by `discord_id`) the name and discriminator of `discord_users`
+        (discord.py Users, or anything with `id`, `name` and `discriminator`) with one `INSERT ... ON CONFLICT` per batch.
+        Empty names and discriminators (users that weren't cached) don't overwrite known ones.
+        Returns a dict of Discord ID -> primary key.
+        """
+        # a batch can't touch the same row twice
+        discord_users = list({discord_user.id: discord_user for discord_user in discord_users}.values())
+        table = connection.ops.quote_name(self.model._meta.db_table)
+        now = timezone.now()
+
+        pks = {}
+        with connection.cursor() as cursor:
+            for start in range(0, len(discord_users), batch_size):
+                batch = discord_users[start:start + batch_size]
+                discord_ids = [discord_user.id for discord_user in batch]
+
+                # only new users need a server seed, existing ones keep theirs
+                cursor.execute(f'SELECT discord_id FROM {table} WHERE discord_id = ANY(%s)', [discord_ids])
+                existing_ids = {row[0] for row in cursor.fetchall()}
+                server_seeds = [
+                    '' if discord_id in existing_ids else generate_server_seed()
+                    for discord_id in discord_ids
+                ]
+
+                cursor.execute(
+                    f'''
+                    INSERT INTO {table} (discord_id, name, discriminator, logged_at, user_seed, server_seed, nonce)
+                    SELECT discord_id, name, discriminator, %s, discord_id::text, server_seed, 0
+                    FROM unnest(%s::bigint[], %s::varchar[], %s::varchar[], %s::varchar[])
+                        AS entry (discord_id, name, discriminator, server_seed)
+                    ON CONFLICT (discord_id) DO UPDATE
+                    SET name = COALESCE(NULLIF(EXCLUDED.name, ''), {table}.name),
+                        discriminator = COALESCE(NULLIF(EXCLUDED.discriminator, ''), {table}.discriminator)
+                    RETURNING id, discord_id
+                    ''',
+                    [
+                        now,
+                        discord_ids,
+                        [discord_user.name for discord_user in batch],
+                        [discord_user.discriminator for discord_user in batch],
+                        server_seeds,
+                    ]
+                )
+                pks.update((discord_id, pk) for pk, discord_id in cursor.fetchall())
+
+        return pks
+
+
 class DiscordUser(models.Model):
-    discord_id = models.BigIntegerField()
+    discord_id = models.BigIntegerField(unique=True)
     name = models.CharField(max_length=200, blank=True)
     discriminator = models.CharField(max_length=4)
     logged_at = models.DateTimeField(auto_now_add=True)
@@ -18,6 +69,8 @@ class DiscordUser(models.Model):
     server_seed = models.CharField(max_length=300)
     nonce = models.PositiveIntegerField(default=0)
 
+    objects = DiscordUserManager()
+
     def __str__(self):
         return f'{self.name}#{self.discriminator}'
 
@@ -39,20 +92,21 @@ class DiscordUser(models.Model):
             return hashlib.sha512(self.server_seed.encode()).hexdigest()
         return None
 
-    def pfair_randomize(self, index):
-
-        HMAC = hmac.new(
-            self.server_seed.encode(),
-            f'{self.user_seed}-{self.nonce}'.encode(),
-            'sha512'
-        )
-        hmac_str = HMAC.hexdigest()
-        to_decimal = int(hmac_str[:5], 16)
-
-        result = to_decimal % index
-
-        self.nonce += 1
-        self.save()
-
-        return result, self.nonce - 1
+    def reserve_nonces(self, count):
+        """
+        Reserves `count` consecutive nonces with one atomic `UPDATE ... RETURNING`.
+        Returns the first reserved nonce, and refreshes the seeds they go with.
+        Inside a transaction, the row stays locked until it ends: concurrent draws of the same
+        user wait instead of reusing nonces, and a rollback gives the nonces back.
+        """
+        table = connection.ops.quote_name(self._meta.db_table)
+
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f'UPDATE {table} SET nonce = nonce + %s WHERE id = %s RETURNING nonce, user_seed, server_seed',
+                [count, self.id]
+            )
+            self.nonce, self.user_seed, self.server_seed = cursor.fetchone()
+
+        return self.nonce - count
 
@@ -65,6 +65,22 @@ WSGI_APPLICATION = 'db.config.wsgi.application'
 
 # Database
 
+# Connections are kept open (the bot is a long-running process) and reused for this many seconds
+DATABASE_CONN_MAX_AGE = config('DATABASE_CONN_MAX_AGE', cast=int, default=600)
+# Connections idle for longer than this many seconds are pinged before being reused
+DATABASE_HEALTH_CHECK_INTERVAL = config('DATABASE_HEALTH_CHECK_INTERVAL', cast=int, default=30)
+# Set when connecting through a transaction-mode pooler such as pgbouncer
+DATABASE_PGBOUNCER = config('DATABASE_PGBOUNCER', cast=bool, default=False)
+
+DATABASE_OPTIONS = {
+    'connect_timeout': 10,
+    # lets the OS notice connections silently dropped by the server or a firewall
+    'keepalives': 1,
+    'keepalives_idle': 60,
+    'keepalives_interval': 10,
+    'keepalives_count': 3,
+}
+
 # local database
 if DEBUG:
     DATABASES = {
@@ -75,6 +91,10 @@ if DEBUG:
             'PASSWORD': config('DATABASE_PASSWORD'),
             'HOST': '127.0.0.1',
             'PORT': '5432',
+            'CONN_MAX_AGE': DATABASE_CONN_MAX_AGE,
+            'OPTIONS': DATABASE_OPTIONS,
+            # server-side cursors don't survive transaction pooling
+            'DISABLE_SERVER_SIDE_CURSORS': DATABASE_PGBOUNCER,
         }
     }
 # production database
@@ -86,8 +106,12 @@ else:
             'NAME': config('DATABASE_NAME'),
             'USER': config('DATABASE_USER'),
             'PASSWORD': config('DATABASE_PASSWORD'),
-            'HOST': '127.0.0.1',
-            'PORT': '5432',
+            'HOST': config('DATABASE_HOST', default='127.0.0.1'),
+            'PORT': config('DATABASE_PORT', default='5432'),
+            'CONN_MAX_AGE': DATABASE_CONN_MAX_AGE,
+            'OPTIONS': DATABASE_OPTIONS,
+            # server-side cursors don't survive transaction pooling
+            'DISABLE_SERVER_SIDE_CURSORS': DATABASE_PGBOUNCER,
         }
     }
 
@@ -140,6 +164,11 @@ BOT_TOKEN = config('BOT_TOKEN')
 BOT_PREFIX = config('BOT_PREFIX', default='!')
 BOT_OWNER_ID = config('BOT_OWNER_ID', cast=int, default=0)
 
+# Low-memory mode: no member, presence or message caches except the bot's own member
+# and the last GIVEAWAY_MESSAGE_CACHE_SIZE giveaway messages (see README)
+LOW_MEMORY_MODE = config('LOW_MEMORY_MODE', cast=bool, default=False)
+GIVEAWAY_MESSAGE_CACHE_SIZE = config('GIVEAWAY_MESSAGE_CACHE_SIZE', cast=int, default=100)
+
 # Discord Embed settings
 EMBED_DEFAULT_COLOR = int(config('EMBED_DEFAULT_COLOR', default='0x1abc9c'), 16)
 
@@ -148,3 +177,17 @@ REACT_EMOJI_ID = config('REACT_EMOJI_ID', cast=int, default=587191414446751749)
 
 # Task Timing Settings
 UPDATE_GIVEAWAY_REMAINING_TIME_DELAY = config('UPDATE_GIVEAWAY_REMAINING_TIME_DELAY', cast=int, default=60)
+# Entrants tracked from reaction events are written to the database every this many seconds
+ENTRANT_FLUSH_INTERVAL = config('ENTRANT_FLUSH_INTERVAL', cast=int, default=5)
+
+# Ended giveaways are moved to the archive tables after this many days (`archivegiveaways` command)
+GIVEAWAY_ARCHIVE_AFTER_DAYS = config('GIVEAWAY_ARCHIVE_AFTER_DAYS', cast=int, default=30)
+
+# Task Concurrency Settings
+GIVEAWAY_WORKER_CONCURRENCY = config('GIVEAWAY_WORKER_CONCURRENCY', cast=int, default=20)
+GIVEAWAY_WORKER_CHANNEL_CONCURRENCY = config('GIVEAWAY_WORKER_CHANNEL_CONCURRENCY', cast=int, default=2)
+GIVEAWAY_WORKER_GUILD_CONCURRENCY = config('GIVEAWAY_WORKER_GUILD_CONCURRENCY', cast=int, default=5)
+
+# Number of threads running the bot's queries, each keeps one persistent database connection,
+# so this is also the bot's connection pool size. Defaults to one per giveaway worker
+DATABASE_THREAD_POOL_SIZE = config('DATABASE_THREAD_POOL_SIZE', cast=int, default=GIVEAWAY_WORKER_CONCURRENCY)
@@ -0,0 +1,275 @@
+import asyncio
+import functools
+import re
+from datetime import datetime, timedelta, timezone
+
+# number of distinct inputs whose parsed form is remembered
+PARSE_CACHE_SIZE = 1024
+
+RELATIVE_UNITS = {
+    'w': 7 * 24 * 60 * 60,
+    'wk': 7 * 24 * 60 * 60,
+    'week': 7 * 24 * 60 * 60,
+    'd': 24 * 60 * 60,
+    'day': 24 * 60 * 60,
+    'h': 60 * 60,
+    'hr': 60 * 60,
+    'hour': 60 * 60,
+    'm': 60,
+    'min': 60,
+    'minute': 60,
+    's': 1,
+    'sec': 1,
+    'second': 1,
+}
+
+MONTHS = {
+    'jan': 1, 'january': 1,
+    'feb': 2, 'february': 2,
+    'mar': 3, 'march': 3,
+    'apr': 4, 'april': 4,
+    'may': 5,
+    'jun': 6, 'june': 6,
+    'jul': 7, 'july': 7,
+    'aug': 8, 'august': 8,
+    'sep': 9, 'sept': 9, 'september': 9,
+    'oct': 10, 'october': 10,
+    'nov': 11, 'november': 11,
+    'dec': 12, 'december': 12,
+}
+
+# common timezone abbreviations -> UTC offset in minutes
+TIMEZONE_OFFSETS = {
+    'utc': 0, 'gmt': 0, 'z': 0,
+    'wet': 0, 'west': 60, 'bst': 60,
+    'cet': 60, 'cest': 2 * 60,
+    'eet': 2 * 60, 'eest': 3 * 60, 'msk': 3 * 60,
+    'ist': 5 * 60 + 30,
+    'ict': 7 * 60, 'wib': 7 * 60,
+    'sgt': 8 * 60, 'hkt': 8 * 60, 'awst': 8 * 60, 'pht': 8 * 60,
+    'jst': 9 * 60, 'kst': 9 * 60,
+    'acst': 9 * 60 + 30, 'acdt': 10 * 60 + 30,
+    'aest': 10 * 60, 'aedt': 11 * 60,
+    'nzst': 12 * 60, 'nzdt': 13 * 60,
+    'brt': -3 * 60, 'art': -3 * 60,
+    'ast': -4 * 60, 'adt': -3 * 60,
+    'est': -5 * 60, 'edt': -4 * 60,
+    'cst': -6 * 60, 'cdt': -5 * 60,
+    'mst': -7 * 60, 'mdt': -6 * 60,
+    'pst': -8 * 60, 'pdt': -7 * 60,
+    'akst': -9 * 60, 'akdt': -8 * 60,
+    'hst': -10 * 60,
+}
+
+# words that carry no meaning in "at 10AM on June 24th" and the like
+FILLER_WORDS = {'at', 'on', 'the', 'of'}
+
+# "in 10 hours" or "10 hours from now", dateparser reads a bare "10 hours" as 10 hours ago
+RELATIVE_RE = re.compile(r'^(?:in\s+(.+?)(?:\s+(?:from\s+now|later))?|(.+?)\s+(?:from\s+now|later))$')
+# separators between the parts of "10 hours, 5 minutes and 30 seconds"
+RELATIVE_SEPARATORS_RE = re.compile(r'[\s,]+')
+# "10", or "10h" with its unit
+RELATIVE_AMOUNT_RE = re.compile(r'^(\d+)([a-z]*)$')
+ISO_RE = re.compile(
+    r'^(\d{4})-(\d{1,2})-(\d{1,2})'
+    r'(?:[t\s]+(\d{1,2}):(\d{2})(?::(\d{2})(?:\.\d+)?)?)?'
+    r'\s*(z|[+-]\d{2}:?\d{2}|[a-z]+)?$'
+)
+TIME_RE = re.compile(r'^(\d{1,2})(?::(\d{2}))?(?::(\d{2}))?(am|pm)?$')
+DAY_RE = re.compile(r'^(\d{1,2})(?:st|nd|rd|th)?$')
+OFFSET_RE = re.compile(r'^(?:utc|gmt)?([+-])(\d{1,2})(?::?(\d{2}))?$')
+
+
+def _timezone(name_or_offset):
+    """Returns the tzinfo of a timezone abbreviation or a `+HH:MM` offset, or None if it is neither."""
+    if name_or_offset in TIMEZONE_OFFSETS:
+        minutes = TIMEZONE_OFFSETS[name_or_offset]
+        if minutes == 0:
+            return timezone.utc
+        return timezone(timedelta(minutes=minutes), name_or_offset.upper())
+
+    match = OFFSET_RE.match(name_or_offset)
+    if not match:
+        return None
+
+    sign, hours, minutes = match.groups()
+    offset = timedelta(hours=int(hours), minutes=int(minutes or 0))
+    if offset >= timedelta(hours=24):
+        return None
+    return timezone(-offset if sign == '-' else offset)
+
+
+def _parse_relative(text):
+    match = RELATIVE_RE.match(text)
+    if not match:
+        return None
+
+    tokens = [token for token in RELATIVE_SEPARATORS_RE.split(match.group(1) or match.group(2)) if token and token != 'and']
+    if not tokens:
+        return None
+
+    seconds = 0
+    amount = None
+    for token in tokens:
+        if amount is None:
+            # "a"/"an" only as whole words, "at" or "as" aren't an amount
+            if token in ('a', 'an'):
+                amount = 1
+                continue
+
+            amount_match = RELATIVE_AMOUNT_RE.match(token)
+            if not amount_match:
+                return None
+            amount, unit = int(amount_match.group(1)), amount_match.group(2)
+            # the unit is the next token
+            if not unit:
+                continue
+        else:
+            unit = token
+
+        # "hours" and "hrs" are "hour" and "hr"
+        if unit not in RELATIVE_UNITS and unit.endswith('s'):
+            unit = unit[:-1]
+        if unit not in RELATIVE_UNITS:
+            return None
+        seconds += amount * RELATIVE_UNITS[unit]
+        amount = None
+
+    # an amount without its unit
+    if amount is not None:
+        return None
+
+    try:
+        return timedelta(seconds=seconds)
+    except OverflowError:
+        return None
+
+
+def _parse_iso(text):
+    match = ISO_RE.match(text)
+    if not match:
+        return None
+
+    year, month, day, hour, minute, second, tz_text = match.groups()
+    tzinfo = timezone.utc
+    if tz_text:
+        tzinfo = _timezone(tz_text)
+        if tzinfo is None:
+            return None
+
+    return (
+        int(year), int(month), int(day),
+        int(hour) if hour else 0, int(minute) if minute else 0, int(second) if second else 0,
+        tzinfo,
+    )
+
+
+def _parse_absolute(text):
+    """Parses "10AM June 24th, 2019 PDT" and the same parts in any order."""
+    # "10 am" is "10am", "june 24th, 2019" is "june 24th 2019"
+    text = re.sub(r'(\d)\s+(am|pm)\b', r'\1\2', text.replace(',', ' '))
+
+    year = month = day = time = tzinfo = None
+    for token in text.split():
+        if token in FILLER_WORDS:
+            continue
+
+        time_match = TIME_RE.match(token)
+        # a bare number is a day, a time has minutes or AM/PM
+        if time_match and time is None and (time_match.group(2) or time_match.group(4)):
+            hour, minute, second, meridiem = time_match.groups()
+            hour, minute, second = int(hour), int(minute or 0), int(second or 0)
+            if meridiem:
+                if not 1 <= hour <= 12:
+                    return None
+                hour = hour % 12 + (12 if meridiem == 'pm' else 0)
+            time = (hour, minute, second)
+        elif token in MONTHS and month is None:
+            month = MONTHS[token]
+        elif DAY_RE.match(token) and day is None:
+            day = int(DAY_RE.match(token).group(1))
+        elif token.isdigit() and len(token) == 4 and year is None:
+            year = int(token)
+        elif tzinfo is None and _timezone(token) is not None:
+            tzinfo = _timezone(token)
+        else:
+            return None
+
+    # a date needs both its month and day, a lone time is today
+    if (month is None) != (day is None) or (month is None and time is None) or (year is not None and month is None):
+        return None
+
+    return year, month, day, time, tzinfo or timezone.utc
+
+
+@functools.lru_cache(maxsize=PARSE_CACHE_SIZE)
+def parse_spec(text):
+    """
+    Returns what `text` means independently of the current time: a timedelta for relative inputs,
+    a tuple of (year, month, day, time, tzinfo) with None for the missing parts otherwise,
+    or None if `text` isn't one of the common formats.
+    """
+    text = ' '.join(text.lower().split())
+
+    relative = _parse_relative(text)
+    if relative is not None:
+        return relative
+
+    iso = _parse_iso(text)
+    if iso is not None:
+        year, month, day, hour, minute, second, tzinfo = iso
+        return year, month, day, (hour, minute, second), tzinfo
+
+    return _parse_absolute(text)
+
+
+def fast_parse(text, now=None):
+    """
+    Parses the common date time formats ("in 10 hours and 30 minutes", "2019-06-24 10:00",
+    "10AM June 24th, 2019 PDT"). Returns an aware datetime, or None if `text` isn't one of them.
+    The default timezone is `UTC`.
+    """
+    spec = parse_spec(text)
+    if spec is None:
+        return None
+
+    now = now or datetime.now(timezone.utc)
+    try:
+        if isinstance(spec, timedelta):
+            return now + spec
+
+        year, month, day, time, tzinfo = spec
+        local_now = now.astimezone(tzinfo)
+        # like dateparser: the current year for dates without year, midnight for dates without time
+        # ("2019-06-24" and "June 24th, 2019" alike), and today for a lone time
+        hour, minute, second = time or (0, 0, 0)
+
+        return datetime(
+            year or local_now.year, month or local_now.month, day or local_now.day,
+            hour, minute, second, tzinfo=tzinfo,
+        )
+    except (ValueError, OverflowError):
+        # "February 30th", or too far away
+        return None
+
+
+def dateparser_parse(text):
+    """Parses `text` with dateparser, which understands much more than `fast_parse` but is slow."""
+    # imported on first use, it is slow to import
+    import dateparser
+
+    return dateparser.parse(text, settings={'RETURN_AS_TIMEZONE_AWARE': True})
+
+
+async def aparse_datetime(text):
+    """
+    Parses a date time entered by a user: with `fast_parse` when it can,
+    with dateparser on a worker thread otherwise, so the event loop never waits on it.
+    Returns an aware datetime or None.
+    """
+    parsed_dt = fast_parse(text)
+    if parsed_dt is not None:
+        return parsed_dt
+
+    loop = asyncio.get_event_loop()
+    return await loop.run_in_executor(None, dateparser_parse, text)
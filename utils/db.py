@@ -0,0 +1,75 @@
+import asyncio
+import functools
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.db import close_old_connections, connection, InterfaceError, OperationalError
+
+_executor = None
+# per database thread: when its connection was last used
+_thread_state = threading.local()
+
+
+def get_db_executor():
+    """
+    Returns the thread pool every database query of the bot runs on.
+    Each thread keeps its own Django database connection.
+    """
+    global _executor
+
+    if _executor is None:
+        _executor = ThreadPoolExecutor(
+            max_workers=settings.DATABASE_THREAD_POOL_SIZE,
+            thread_name_prefix='db',
+        )
+
+    return _executor
+
+
+def _check_connection():
+    """Closes this thread's connection if it sat idle too long and doesn't answer anymore."""
+    last_used_at = getattr(_thread_state, 'last_used_at', None)
+    idle_for = time.monotonic() - last_used_at if last_used_at is not None else 0
+
+    if connection.connection is not None and idle_for > settings.DATABASE_HEALTH_CHECK_INTERVAL:
+        if not connection.is_usable():
+            connection.close()
+
+
+def _run_with_connection(func, *args, **kwargs):
+    # drops connections that are broken or past their max age, like Django does per request
+    close_old_connections()
+    _check_connection()
+    try:
+        try:
+            connection.ensure_connection()
+        except (InterfaceError, OperationalError):
+            # the server went away (restart, idle timeout) before anything was sent: reconnect once.
+            # `func` itself is never retried, the server may have committed what it did before failing
+            connection.close()
+            connection.ensure_connection()
+        return func(*args, **kwargs)
+    finally:
+        _thread_state.last_used_at = time.monotonic()
+        close_old_connections()
+
+
+async def run_in_db_thread(func, *args, **kwargs):
+    """Runs the blocking `func(*args, **kwargs)` on the database thread pool and awaits its result."""
+    loop = asyncio.get_event_loop()
+    return await loop.run_in_executor(
+        get_db_executor(),
+        functools.partial(_run_with_connection, func, *args, **kwargs)
+    )
+
+
+def database_sync_to_async(func):
+    """Turns the blocking `func` into a coroutine function that runs it with `run_in_db_thread`."""
+
+    @functools.wraps(func)
+    async def wrapper(*args, **kwargs):
+        return await run_in_db_thread(func, *args, **kwargs)
+
+    return wrapper
@@ -0,0 +1,103 @@
+from utils.entrants import EntrantSet
+from utils.pfair import pfair_index, pfair_uniform
+
+# v1: first 5 letters of one HMAC per nonce modulo the number of entrants, duplicates retried with the next nonce
+DRAW_V1 = 1
+# v2: partial Fisher-Yates shuffle of the sorted entrants, one bias-free whole-HMAC draw per winner
+DRAW_V2 = 2
+DRAW_VERSIONS = (DRAW_V1, DRAW_V2)
+LATEST_DRAW_VERSION = DRAW_V2
+
+
+class WinnerSelector(object):
+    """
+    Picks winners among entrants (an `EntrantSet`, or Discord IDs that are then sorted once into one),
+    an entrant's Index is its position in the sorted entrants.
+    """
+
+    def __init__(self, entrant_ids):
+        self.entrants = entrant_ids if isinstance(entrant_ids, EntrantSet) else EntrantSet(entrant_ids)
+
+    def __len__(self):
+        return len(self.entrants)
+
+    def is_sure_win(self, winner_count):
+        return len(self.entrants) <= winner_count
+
+    def select(self, winner_count, creator, draw_version=LATEST_DRAW_VERSION):
+        """
+        Returns a list of (Discord ID, Index, Nonce) of the winners.
+        Sure wins (not more entrants than winners) get everyone, with Index and Nonce 0.
+        Otherwise `creator` (a DiscordUser, or anything with `reserve_nonces` and seeds) draws them
+        with the algorithm of `draw_version`.
+        """
+        if self.is_sure_win(winner_count):
+            return [(entrant, 0, 0) for entrant in self.entrants]
+
+        if draw_version == DRAW_V1:
+            draws = self.draw_indexes(winner_count, creator)
+        elif draw_version == DRAW_V2:
+            draws = self.shuffle_indexes(winner_count, creator)
+        else:
+            raise ValueError(f'Unknown draw version: {draw_version}')
+
+        return [(self.entrants[index], index, nonce) for index, nonce in draws]
+
+    def draw_indexes(self, winner_count, creator):
+        """
+        Draw version 1.
+        Draws `winner_count` distinct Indexes, as a list of (Index, Nonce).
+        Each nonce gives one Index and duplicates are skipped, so the next nonce is used until
+        there are enough distinct Indexes. Nonces are reserved in blocks of the number still needed,
+        which never leaves any unused.
+        """
+        entrant_count = len(self.entrants)
+        draws = []
+        drawn_indexes = set()
+
+        while len(draws) < winner_count:
+            needed = winner_count - len(draws)
+            first_nonce = creator.reserve_nonces(needed)
+
+            for nonce in range(first_nonce, first_nonce + needed):
+                index = pfair_index(creator.server_seed, creator.user_seed, nonce, entrant_count)
+                if index in drawn_indexes:
+                    continue
+
+                drawn_indexes.add(index)
+                draws.append((index, nonce))
+
+        return draws
+
+    def shuffle_indexes(self, winner_count, creator):
+        """
+        Draw version 2.
+        Draws `winner_count` distinct Indexes, as a list of (Index, Nonce), in exactly `winner_count` steps:
+        step N (from 0) uses nonce `first nonce + N` to pick a position P in [N, number of entrants) and
+        swaps positions N and P of the sorted entrants, the winner is whoever lands on position N.
+        """
+        entrant_count = len(self.entrants)
+        first_nonce = creator.reserve_nonces(winner_count)
+
+        # position -> Index now there, for the positions swapped so far (the others still hold their own Index)
+        swapped = {}
+        draws = []
+
+        for step in range(winner_count):
+            nonce = first_nonce + step
+            index = shuffle_step(swapped, step, entrant_count, creator.server_seed, creator.user_seed, nonce)
+            draws.append((index, nonce))
+
+        return draws
+
+
+def shuffle_step(swapped, step, entrant_count, server_seed, user_seed, nonce):
+    """
+    Runs step `step` of draw version 2 with `nonce` and returns the Index landing on position `step`.
+    `swapped` (position -> Index) holds the positions swapped by the previous steps and is updated.
+    """
+    position = step + pfair_uniform(server_seed, user_seed, nonce, entrant_count - step)
+
+    index = swapped.get(position, position)
+    swapped[position] = swapped.get(step, step)
+    return index
@@ -0,0 +1,75 @@
+import sys
+import zlib
+from array import array
+from bisect import bisect_left
+from itertools import accumulate, groupby
+from operator import sub
+
+
+class EntrantSet(object):
+    """
+    Discord IDs of a giveaway's entrants, as a sorted array of 64-bit integers (8 bytes per entrant).
+    An entrant's rank in it is the Index draws use.
+    `pack()` turns it into delta-encoded, zlib-compressed bytes to be stored in a single column.
+    """
+
+    def __init__(self, discord_ids=()):
+        self._ids = array('q', sorted(set(discord_ids)))
+
+    @classmethod
+    def _from_array(cls, ids):
+        entrant_set = cls()
+        entrant_set._ids = ids
+        return entrant_set
+
+    def __len__(self):
+        return len(self._ids)
+
+    def __iter__(self):
+        return iter(self._ids)
+
+    def __getitem__(self, rank):
+        return self._ids[rank]
+
+    def __contains__(self, discord_id):
+        rank = bisect_left(self._ids, discord_id)
+        return rank < len(self._ids) and self._ids[rank] == discord_id
+
+    def __eq__(self, other):
+        return isinstance(other, EntrantSet) and self._ids == other._ids
+
+    def __repr__(self):
+        return f'<EntrantSet of {len(self._ids)} entrants>'
+
+    def index(self, discord_id):
+        """Returns the rank of `discord_id`, raises ValueError if it isn't an entrant."""
+        rank = bisect_left(self._ids, discord_id)
+        if rank == len(self._ids) or self._ids[rank] != discord_id:
+            raise ValueError(f'{discord_id} is not an entrant')
+        return rank
+
+    def union(self, discord_ids):
+        """Returns a new EntrantSet with `discord_ids` added, in linear time on the size of this one."""
+        merged = list(self._ids)
+        # two sorted runs, which the sort merges without comparing the whole list again
+        merged.extend(sorted(discord_ids))
+        merged.sort()
+        return self._from_array(array('q', (discord_id for discord_id, _ in groupby(merged))))
+
+    def pack(self):
+        # gaps between sorted snowflakes are much smaller than the snowflakes, their high bytes compress away
+        deltas = array('q', self._ids[:1])
+        deltas.extend(map(sub, self._ids[1:], self._ids))
+
+        if sys.byteorder == 'big':
+            deltas.byteswap()
+        return zlib.compress(deltas.tobytes())
+
+    @classmethod
+    def unpack(cls, data):
+        """Returns the EntrantSet packed in `data` (bytes or memoryview, as returned by `BinaryField`)."""
+        deltas = array('q')
+        deltas.frombytes(zlib.decompress(data))
+        if sys.byteorder == 'big':
+            deltas.byteswap()
+        return cls._from_array(array('q', accumulate(deltas)))
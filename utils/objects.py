@@ -1,5 +1,6 @@
 from db.apps.guilds.models import DiscordGuild
 from db.apps.users.models import DiscordUser
+from utils.db import database_sync_to_async
 
 
 def get_user_obj(discord_user):
@@ -22,3 +23,7 @@ def get_guild_obj(discord_guild):
     )
 
     return guild_obj, created
+
+
+aget_user_obj = database_sync_to_async(get_user_obj)
+aget_guild_obj = database_sync_to_async(get_guild_obj)
@@ -0,0 +1,41 @@
+import hmac
+
+# number of distinct values of a whole HMAC-SHA512 (512 bits)
+HMAC_RANGE = 2 ** 512
+
+
+def pfair_hmac(server_seed, user_seed, nonce, sub_round=0):
+    """
+    Returns the hex digest of HMAC-SHA512 keyed with `server_seed` over `[user_seed]-[nonce]`,
+    or over `[user_seed]-[nonce]-[sub_round]` for sub-rounds after the first.
+    """
+    message = f'{user_seed}-{nonce}' if not sub_round else f'{user_seed}-{nonce}-{sub_round}'
+    return hmac.new(
+        server_seed.encode(),
+        message.encode(),
+        'sha512'
+    ).hexdigest()
+
+
+def pfair_index(server_seed, user_seed, nonce, index):
+    """Returns the Index drawn with `nonce`: the first 5 letters of the HMAC in decimal, modulo `index`."""
+    hmac_str = pfair_hmac(server_seed, user_seed, nonce)
+    to_decimal = int(hmac_str[:5], 16)
+
+    return to_decimal % index
+
+
+def pfair_uniform(server_seed, user_seed, nonce, bound):
+    """
+    Returns a number in [0, `bound`) drawn with `nonce`, without modulo bias: the whole HMAC in decimal,
+    modulo `bound`. HMACs in the last, incomplete block of `bound` numbers are rejected and the next
+    sub-round's HMAC is used instead (it happens with a probability below `bound` / 2^512).
+    """
+    limit = HMAC_RANGE - HMAC_RANGE % bound
+
+    sub_round = 0
+    while True:
+        to_decimal = int(pfair_hmac(server_seed, user_seed, nonce, sub_round), 16)
+        if to_decimal < limit:
+            return to_decimal % bound
+        sub_round += 1
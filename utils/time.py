@@ -1,4 +1,4 @@
-from math import floor
+from math import ceil, floor
 
 
 def check_time_elapsed(td):
@@ -50,3 +50,71 @@ def process_elapsed_time_text(td):
         elapsed_time_text = elapsed_time_text.replace('0 seconds', '').strip()
 
     return elapsed_time_text
+
+
+# (remaining seconds at least, step in seconds) used to round the time remaining shown
+# on giveaway messages: coarse when hours remain, every minute under 10 minutes, every second in the final minute
+REMAINING_TIME_STEPS = (
+    (24 * 60 * 60, 60 * 60),
+    (60 * 60, 15 * 60),
+    (10 * 60, 5 * 60),
+    (60, 60),
+    (0, 1),
+)
+
+
+def _to_seconds(td):
+    if td.__class__.__name__ == 'timedelta':
+        return td.total_seconds()
+    return td
+
+
+def remaining_time_step(td):
+    """
+    Returns the step (in seconds) the time remaining is rounded to.
+    'td' is a timedelta object or integer number in seconds.
+    """
+    total_seconds = _to_seconds(td)
+
+    for threshold, step in REMAINING_TIME_STEPS:
+        if total_seconds >= threshold:
+            return step
+
+    return REMAINING_TIME_STEPS[-1][1]
+
+
+def process_remaining_time_text(td):
+    """
+    Returns a string that shows the time remaining, rounded up to its step, in this format:
+    x day(s) x hour(s) x minute(s) x second(s)
+    if any of the x == 0, the indicator and x will not show.
+    """
+    total_seconds = _to_seconds(td)
+    step = remaining_time_step(total_seconds)
+    rounded_seconds = ceil(total_seconds / step) * step
+
+    day, hour, minute, second = check_time_elapsed(rounded_seconds)
+
+    parts = []
+    for value, unit in ((day, 'day'), (hour, 'hour'), (minute, 'minute'), (second, 'second')):
+        if value == 1:
+            parts.append(f'{value} {unit}')
+        elif value > 1:
+            parts.append(f'{value} {unit}s')
+
+    return ' '.join(parts) or '0 seconds'
+
+
+def next_remaining_time_refresh(td):
+    """
+    Returns the number of seconds until the text from `process_remaining_time_text` changes.
+    'td' is a timedelta object or integer number in seconds.
+    """
+    total_seconds = max(_to_seconds(td), 0)
+
+    delay = total_seconds % remaining_time_step(total_seconds)
+    if delay > 0:
+        return delay
+
+    # exactly on a step boundary, the next change happens one (smaller) step later
+    return remaining_time_step(total_seconds - 0.001)